@@ -1,19 +1,30 @@
 from __future__ import annotations
 
-import glob
+import hashlib
+import os
 import sys
-from pathlib import Path
+from typing import Optional
 
 import typer
 
-from src.publish.playwright_steps import run_delete_drafts_sync, run_save_draft_sync
-from src.storage.files import list_executions, list_posts, load_post, save_post
+from src.publish.playwright_steps import (
+    effective_concurrency,
+    run_delete_drafts_batch_sync,
+    run_save_draft_parallel_sync,
+    run_save_draft_sync,
+)
+from src.storage.files import glob_files, list_executions, list_posts_summary, load_post, save_post
 from src.storage.models import Execution, PostStatus, PostType, now_iso
-from src.validation import validate_post
+from src.validation import ValidationResult, validate_post
 from src.workflow.create_post import create_daily_news_posts, create_post_with_draft
 
 app = typer.Typer(help="小红书自动发帖（生成并保存草稿）CLI")
 
+# Per-process cache of list_executions() results; invalidated after each draft run.
+_EXECUTIONS_CACHE: dict[str, list[Execution]] = {}
+# Per-process cache of validate_post() results keyed by a hash of the post content.
+_VALIDATION_CACHE: dict[bytes, ValidationResult] = {}
+
 
 def _ensure_utf8_output() -> None:
     try:
@@ -30,17 +41,38 @@ def _main_callback() -> None:
 
 def _resolve_asset_paths(post, assets_glob: str) -> list[str]:
     glob_pattern = assets_glob or f"data/posts/{post.id}/assets/*"
-    asset_paths = [p for p in glob.glob(glob_pattern) if Path(p).is_file()]
+    asset_paths = glob_files(glob_pattern)
     if not asset_paths:
-        asset_paths = [a.path for a in post.assets if Path(a.path).is_file()]
+        asset_paths = [a.path for a in post.assets if os.path.isfile(a.path)]
     return asset_paths
 
 
-def _next_attempt(post_id: str) -> int:
-    executions = list_executions(post_id)
+def _cached_executions(post_id: str) -> list[Execution]:
+    executions = _EXECUTIONS_CACHE.get(post_id)
+    if executions is None:
+        executions = _EXECUTIONS_CACHE[post_id] = list_executions(post_id)
+    return executions
+
+
+def _invalidate_executions(post_id: str) -> None:
+    _EXECUTIONS_CACHE.pop(post_id, None)
+
+
+def _next_attempt(post_id: str, executions: Optional[list[Execution]] = None) -> int:
+    if executions is None:
+        executions = _cached_executions(post_id)
     return max((e.attempt for e in executions), default=0) + 1
 
 
+def _validate_cached(post) -> ValidationResult:
+    # Any field change yields a new key, so mutated posts are simply re-validated.
+    key = hashlib.blake2b(post.model_dump_json().encode("utf-8"), digest_size=16).digest()
+    result = _VALIDATION_CACHE.get(key)
+    if result is None:
+        result = _VALIDATION_CACHE[key] = validate_post(post)
+    return result
+
+
 def _apply_execution_status(post_status: PostStatus, result: str) -> PostStatus:
     if result == "saved_draft":
         return PostStatus.saved_draft
@@ -58,6 +90,18 @@ def _emit_validation(result) -> None:
         typer.echo(f"warn: {warn}")
 
 
+def _emit_steps(exec_rec: Execution) -> None:
+    # One write for the whole step list instead of one per step.
+    if not exec_rec.steps:
+        return
+    typer.echo(
+        "\n".join(
+            f"- {s.name}: {s.status}" + (f" | {s.detail}" if s.detail else "")
+            for s in exec_rec.steps
+        )
+    )
+
+
 @app.command()
 def create(
     title: str = typer.Option(..., help="初始标题/题目"),
@@ -67,7 +111,7 @@ def create(
     no_copy: bool = typer.Option(False, help="不复制素材到 data/posts/<id>/assets"),
 ):
     """生成草稿并落盘（post.json + revision）。"""
-    asset_paths = [p for p in glob.glob(assets_glob) if Path(p).is_file()]
+    asset_paths = glob_files(assets_glob)
     if not asset_paths:
         typer.echo("未找到素材文件，将自动查找配图（如已启用 AUTO_IMAGE 且配置了图片 API）。")
 
@@ -115,7 +159,7 @@ def create(
 @app.command("list")
 def _list():
     """列出现有 post。"""
-    posts = list_posts()
+    posts = list_posts_summary()
     if not posts:
         typer.echo("暂无 post")
         return
@@ -146,7 +190,7 @@ def approve(
         typer.echo("post 不存在")
         raise typer.Exit(code=1)
 
-    result = validate_post(post)
+    result = _validate_cached(post)
     _emit_validation(result)
     if result.errors and not force:
         raise typer.Exit(code=1)
@@ -168,7 +212,7 @@ def validate(
         typer.echo("post 不存在")
         raise typer.Exit(code=1)
 
-    result = validate_post(post)
+    result = _validate_cached(post)
     _emit_validation(result)
     if result.errors:
         raise typer.Exit(code=1)
@@ -197,11 +241,32 @@ def run(
         typer.echo("post 不存在")
         raise typer.Exit(code=1)
 
+    _do_run(
+        post,
+        assets_glob=assets_glob,
+        dry_run=dry_run,
+        login_hold=login_hold,
+        wait_timeout=wait_timeout,
+        force=force,
+    )
+
+
+def _do_run(
+    post,
+    *,
+    assets_glob: str,
+    dry_run: bool,
+    login_hold: int,
+    wait_timeout: int,
+    force: bool,
+    executions: Optional[list[Execution]] = None,
+) -> None:
+    """Shared body of `run`/`retry`; callers pass whatever they already loaded."""
     if post.status != PostStatus.approved and not force:
         typer.echo("post 未审批，请先运行 approve 或使用 --force")
         raise typer.Exit(code=1)
 
-    result = validate_post(post)
+    result = _validate_cached(post)
     _emit_validation(result)
     if result.errors and not force:
         raise typer.Exit(code=1)
@@ -211,7 +276,7 @@ def run(
         typer.echo("未找到素材文件，请检查 assets_glob 或 data/posts/<id>/assets")
         raise typer.Exit(code=1)
 
-    attempt = _next_attempt(post_id)
+    attempt = _next_attempt(post.id, executions)
     exec_rec = Execution(post_id=post.id, attempt=attempt, result="pending")
     exec_rec = run_save_draft_sync(
         post,
@@ -221,15 +286,14 @@ def run(
         wait_timeout_ms=wait_timeout * 1000,
         execution=exec_rec,
     )
+    _invalidate_executions(post.id)
 
     post.status = _apply_execution_status(post.status, exec_rec.result)
     post.updated_at = now_iso()
     save_post(post)
 
     typer.echo(f"result: {exec_rec.result}")
-    for s in exec_rec.steps:
-        detail = f" | {s.detail}" if s.detail else ""
-        typer.echo(f"- {s.name}: {s.status}{detail}")
+    _emit_steps(exec_rec)
     if exec_rec.error:
         typer.echo(f"error: {exec_rec.error}")
 
@@ -247,9 +311,15 @@ def auto(
     login_hold: int = typer.Option(0, help="seconds to wait for manual login"),
     wait_timeout: int = typer.Option(300, help="seconds to wait for publish UI"),
     force: bool = typer.Option(False, help="run even if validation fails"),
+    checkpoint_approved: bool = typer.Option(
+        False, help="persist the approved status before opening the browser"
+    ),
+    concurrency: int = typer.Option(
+        1, help="parallel browser sessions for saving drafts (>1 requires XHS_CDP_URL)"
+    ),
 ):
     """Generate content then save draft in one command."""
-    asset_paths = [p for p in glob.glob(assets_glob) if Path(p).is_file()]
+    asset_paths = glob_files(assets_glob)
     if not asset_paths and not dry_run:
         typer.echo("未找到素材文件，将自动查找配图（如已启用 AUTO_IMAGE 且配置了图片 API）。")
 
@@ -287,36 +357,47 @@ def auto(
     for p in posts:
         typer.echo(f"- post_id={p.id} | 标题：{p.title}")
 
+    jobs: list[tuple] = []
     for post in posts:
-        result = validate_post(post)
+        result = _validate_cached(post)
         _emit_validation(result)
         if result.errors and not force:
             raise typer.Exit(code=1)
 
+        # Approval is kept in memory; the final status is written once after the run.
         post.status = PostStatus.approved
         post.updated_at = now_iso()
-        save_post(post)
+        if checkpoint_approved:
+            save_post(post)
 
         resolved_assets = _resolve_asset_paths(post, "")
         attempt = _next_attempt(post.id)
-        exec_rec = Execution(post_id=post.id, attempt=attempt, result="pending")
-        exec_rec = run_save_draft_sync(
-            post,
-            assets=resolved_assets,
-            dry_run=dry_run,
-            login_hold=login_hold,
-            wait_timeout_ms=wait_timeout * 1000,
-            execution=exec_rec,
+        jobs.append(
+            (post, resolved_assets, Execution(post_id=post.id, attempt=attempt, result="pending"))
         )
 
+    # One browser session per worker (default 1); each post still gets its own page and
+    # Execution. Final statuses are written here on the main thread.
+    posts_by_id = {post.id: post for post, _assets, _pending in jobs}
+    if concurrency > 1 and len(jobs) > 1 and effective_concurrency(concurrency, len(jobs)) <= 1:
+        typer.echo("warn: --concurrency>1 需要设置 XHS_CDP_URL，本次将按顺序保存草稿")
+    executions = run_save_draft_parallel_sync(
+        jobs,
+        concurrency=concurrency,
+        dry_run=dry_run,
+        login_hold=login_hold,
+        wait_timeout_ms=wait_timeout * 1000,
+    )
+    for exec_rec in executions:
+        post = posts_by_id[exec_rec.post_id]
+        _invalidate_executions(post.id)
+
         post.status = _apply_execution_status(post.status, exec_rec.result)
         post.updated_at = now_iso()
         save_post(post)
 
         typer.echo(f"post_id={post.id} result: {exec_rec.result}")
-        for s in exec_rec.steps:
-            detail = f" | {s.detail}" if s.detail else ""
-            typer.echo(f"- {s.name}: {s.status}{detail}")
+        _emit_steps(exec_rec)
         if exec_rec.error:
             typer.echo(f"error: {exec_rec.error}")
 
@@ -353,52 +434,45 @@ def delete_drafts(
         types = ["image", "video", "article"]
 
     def _print_preview(res: dict) -> None:
-        typer.echo(f"type={res.get('draft_type')} total={res.get('total')}")
+        lines = [f"type={res.get('draft_type')} total={res.get('total')}"]
         for item in res.get("items", [])[:5]:
             title = item.get("title") or "(无标题)"
             saved_at = item.get("saved_at") or ""
-            typer.echo(f"- {title} {saved_at}".rstrip())
+            lines.append(f"- {title} {saved_at}".rstrip())
         if res.get("total", 0) > 5:
-            typer.echo("... (仅显示前 5 条)")
-
-    previews: list[dict] = []
-    for t in types:
-        preview = run_delete_drafts_sync(
-            draft_type=t,
-            draft_location=location,
-            draft_url=draft_url,
-            limit=limit,
-            dry_run=True,
-            login_hold=login_hold,
-            wait_timeout_ms=wait_timeout * 1000,
-        )
-        previews.append(preview)
-        _print_preview(preview)
+            lines.append("... (仅显示前 5 条)")
+        typer.echo("\n".join(lines))
 
-    if dry_run:
-        return
+    common = dict(
+        draft_location=location,
+        draft_url=draft_url,
+        limit=limit,
+        login_hold=login_hold,
+        wait_timeout_ms=wait_timeout * 1000,
+    )
 
-    total = sum(p.get("total", 0) for p in previews)
-    if total == 0:
-        typer.echo("未找到草稿")
-        return
+    # The preview pass is only needed for --dry-run or to show what the confirmation is about.
+    if dry_run or not yes:
+        previews = run_delete_drafts_batch_sync(draft_types=types, dry_run=True, **common)
+        for preview in previews:
+            _print_preview(preview)
 
-    if not yes:
-        confirm = typer.confirm(f"将删除草稿（最多 {limit or '全部'} 条），确认继续？")
-        if not confirm:
-            typer.echo("已取消")
+        if dry_run:
             return
 
-    for t in types:
-        res = run_delete_drafts_sync(
-            draft_type=t,
-            draft_location=location,
-            draft_url=draft_url,
-            limit=limit,
-            dry_run=False,
-            login_hold=login_hold,
-            wait_timeout_ms=wait_timeout * 1000,
-        )
+        total = sum(p.get("total", 0) for p in previews)
+        if total == 0:
+            typer.echo("未找到草稿")
+            return
+
+        if not yes:
+            confirm = typer.confirm(f"将删除草稿（最多 {limit or '全部'} 条），确认继续？")
+            if not confirm:
+                typer.echo("已取消")
+                return
+
+    results = run_delete_drafts_batch_sync(draft_types=types, dry_run=False, **common)
+    for res in results:
         typer.echo(
             f"deleted {res.get('deleted', 0)}/{res.get('total', 0)} drafts "
             f"({res.get('draft_type')})"
@@ -425,7 +499,7 @@ def retry(
     force: bool = typer.Option(False, help="retry even if last run was not failed"),
 ):
     """Retry saving a draft (new attempt)."""
-    executions = list_executions(post_id)
+    executions = _cached_executions(post_id)
     if not executions:
         typer.echo("no previous executions found")
         raise typer.Exit(code=1)
@@ -434,13 +508,20 @@ def retry(
         typer.echo(f"last result is {last.result}; use --force to retry anyway")
         raise typer.Exit(code=1)
 
-    run(
-        post_id=post_id,
+    try:
+        post = load_post(post_id)
+    except FileNotFoundError:
+        typer.echo("post 不存在")
+        raise typer.Exit(code=1)
+
+    _do_run(
+        post,
         assets_glob=assets_glob,
         dry_run=dry_run,
         login_hold=login_hold,
         wait_timeout=wait_timeout,
         force=True,
+        executions=executions,
     )
 
 
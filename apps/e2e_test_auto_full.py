@@ -8,6 +8,8 @@ import subprocess
 import sys
 from pathlib import Path
 
+_POST_ID_RE = re.compile(r"post_id=([0-9a-f]{32})")
+
 
 def main() -> int:
     parser = argparse.ArgumentParser(
@@ -63,32 +65,32 @@ def main() -> int:
         cmd.extend(["--prompt", args.prompt])
 
     print("RUN:", " ".join(cmd), flush=True)
-    proc = subprocess.run(
+    # Stream the CLI output line by line (stderr merged) so long runs give live feedback
+    # and we never buffer the whole log in memory.
+    found: dict[str, None] = {}
+    proc = subprocess.Popen(
         cmd,
         env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
         text=True,
         encoding="utf-8",
         errors="replace",
-        capture_output=True,
+        bufsize=1,
     )
-    print(proc.stdout, end="")
-    if proc.stderr.strip():
-        print(proc.stderr, file=sys.stderr)
-
-    out = proc.stdout + "\n" + proc.stderr
-    ids = re.findall(r"post_id=([0-9a-f]{32})", out)
-    if not ids:
+    assert proc.stdout is not None
+    with proc.stdout:
+        for line in proc.stdout:
+            print(line, end="", flush=True)
+            # dict keeps first-seen order and dedupes in C.
+            found.update(dict.fromkeys(_POST_ID_RE.findall(line)))
+    proc.wait()
+    post_ids = list(found)
+
+    if not post_ids:
         print("FAIL: cannot find post_id in output", file=sys.stderr)
         return 2
 
-    seen: set[str] = set()
-    post_ids: list[str] = []
-    for pid in ids:
-        if pid in seen:
-            continue
-        seen.add(pid)
-        post_ids.append(pid)
-
     if len(post_ids) < args.count:
         print(
             f"FAIL: expected >= {args.count} posts, got {len(post_ids)}: {post_ids}",
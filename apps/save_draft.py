@@ -1,14 +1,9 @@
 from __future__ import annotations
 
-import glob
 import sys
-from pathlib import Path
 
 import typer
 
-from src.publish.playwright_steps import run_save_draft_sync
-from src.storage.files import load_post
-
 app = typer.Typer(help="Use Playwright to open the publish page and save a draft.")
 
 
@@ -22,7 +17,9 @@ def _ensure_utf8_output() -> None:
 
 @app.command()
 def run(
-    post_id: str = typer.Argument(..., help="post_id (data/posts/<id>/post.json)"),
+    post_ids: list[str] = typer.Argument(
+        ..., help="post_id(s) (data/posts/<id>/post.json); several ids share one browser session"
+    ),
     assets_glob: str = typer.Option(
         "",
         help="assets glob; default is data/posts/<post_id>/assets/*",
@@ -32,37 +29,67 @@ def run(
         False, help="open page and capture evidence only; skip upload/fill/save"
     ),
     login_hold: int = typer.Option(
-        0, help="seconds to wait for manual login before proceeding"
+        0, help="seconds to wait for manual login before proceeding (first post only)"
     ),
     login_only: bool = typer.Option(
-        False, help="only wait for login/publish UI then exit"
+        False, help="only wait for login/publish UI then exit (single post_id only)"
     ),
     wait_timeout: int = typer.Option(
         300, help="seconds to wait for publish UI before failing"
     ),
 ):
+    # Imported here so `--help` doesn't pay for loading Playwright.
+    from src.publish.playwright_steps import run_save_draft_batch_sync, run_save_draft_sync
+    from src.storage.files import glob_files, load_post
+
     _ensure_utf8_output()
-    try:
-        post = load_post(post_id)
-    except FileNotFoundError:
-        typer.echo("post not found")
+    if login_only and len(post_ids) > 1:
+        typer.echo("--login-only accepts a single post_id")
         raise typer.Exit(code=1)
 
-    glob_pattern = assets_glob or f"data/posts/{post_id}/assets/*"
-    asset_paths = [p for p in glob.glob(glob_pattern) if Path(p).is_file()]
+    jobs = []
+    for post_id in post_ids:
+        try:
+            post = load_post(post_id)
+        except FileNotFoundError:
+            typer.echo(f"post not found: {post_id}")
+            raise typer.Exit(code=1)
+        glob_pattern = assets_glob or f"data/posts/{post_id}/assets/*"
+        jobs.append((post, glob_files(glob_pattern), None))
+
+    if len(jobs) == 1:
+        post, asset_paths, _ = jobs[0]
+        _emit_execution(
+            run_save_draft_sync(
+                post,
+                assets=asset_paths,
+                dry_run=dry_run,
+                login_hold=login_hold,
+                login_only=login_only,
+                wait_timeout_ms=wait_timeout * 1000,
+            )
+        )
+        return
 
-    exec_rec = run_save_draft_sync(
-        post,
-        assets=asset_paths,
+    for exec_rec in run_save_draft_batch_sync(
+        jobs,
         dry_run=dry_run,
         login_hold=login_hold,
-        login_only=login_only,
         wait_timeout_ms=wait_timeout * 1000,
-    )
+    ):
+        typer.echo(f"post_id: {exec_rec.post_id}")
+        _emit_execution(exec_rec)
+
+
+def _emit_execution(exec_rec) -> None:
     typer.echo(f"result: {exec_rec.result}")
-    for s in exec_rec.steps:
-        detail = f" | {s.detail}" if s.detail else ""
-        typer.echo(f"- {s.name}: {s.status}{detail}")
+    if exec_rec.steps:
+        typer.echo(
+            "\n".join(
+                f"- {s.name}: {s.status}" + (f" | {s.detail}" if s.detail else "")
+                for s in exec_rec.steps
+            )
+        )
     if exec_rec.error:
         try:
             typer.echo(f"error: {exec_rec.error}")
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import os
+import re
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -15,6 +17,9 @@ class LLMConfig:
 
 DEFAULT_LLM_BASE_URL = "https://api.ppinfra.com/openai"
 
+# key = value, one per line; lines starting with # are comments.
+_KV_LINE_RE = re.compile(r"^[^\S\n]*((?:[^#\s=][^=\n]*?)?)[^\S\n]*=[^\S\n]*(.*?)[^\S\n]*$", re.MULTILINE)
+
 
 def _parse_llm_key_file(path: Path) -> dict[str, str]:
     """
@@ -22,31 +27,31 @@ def _parse_llm_key_file(path: Path) -> dict[str, str]:
     base_url="https://..."
     model="deepseek/deepseek-v3-0324"
     api_key="sk-..."
+
+    The parse is cached per (path, mtime, size), so edits to the file are picked up.
     """
-    data: dict[str, str] = {}
-    if not path.exists():
-        return data
-    for line in path.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        if "=" not in line:
-            continue
-        k, v = line.split("=", 1)
-        k = k.strip()
-        v = v.strip().strip('"').strip("'")
-        data[k] = v
-    return data
+    try:
+        st = path.stat()
+    except OSError:
+        return {}
+    return dict(_parse_llm_key_file_cached(str(path), st.st_mtime_ns, st.st_size))
+
+
+@lru_cache(maxsize=8)
+def _parse_llm_key_file_cached(path_str: str, mtime_ns: int, size: int) -> dict[str, str]:
+    text = Path(path_str).read_text(encoding="utf-8")
+    return {k: v.strip('"').strip("'") for k, v in _KV_LINE_RE.findall(text)}
 
 
 def load_llm_config(
     *,
     llm_file: Path | str = Path("docs/llm_api-key.md"),
 ) -> LLMConfig:
-    env_model = os.getenv("LLM_MODEL")
-    env_key = os.getenv("LLM_API_KEY")
-    env_base_llm = os.getenv("LLM_BASE_URL")
-    env_base_openai = os.getenv("OPENAI_BASE_URL")
+    env = os.environ
+    env_model = env.get("LLM_MODEL")
+    env_key = env.get("LLM_API_KEY")
+    env_base_llm = env.get("LLM_BASE_URL")
+    env_base_openai = env.get("OPENAI_BASE_URL")
     if (
         env_base_llm
         and env_base_openai
@@ -1,26 +1,64 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import os
-import re
+import random
+import shutil
+import threading
 import time
 import urllib.error
+import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
+from src.images.http_pool import http_request
+
+try:  # optional: faster JSON encode/decode on the request/poll path
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
 DEFAULT_BASE_URL = "https://dashscope.aliyuncs.com"
 DEFAULT_MODEL = "qwen-image-plus"
 DEFAULT_SIZE = "1104*1472"  # 3:4 (适合小红书竖图)
 DEFAULT_TIMEOUT_S = 180.0
 DEFAULT_DOWNLOAD_TIMEOUT_S = 60.0
-DEFAULT_POLL_INTERVAL_S = 2.0
+# Polling starts at POLL_INITIAL_DELAY_S and backs off by POLL_BACKOFF up to POLL_MAX_INTERVAL_S,
+# unless ALIYUN_IMAGE_POLL_INTERVAL_S pins a fixed interval.
+DEFAULT_POLL_INITIAL_DELAY_S = 1.0
+DEFAULT_POLL_BACKOFF = 1.5
+DEFAULT_POLL_MAX_INTERVAL_S = 5.0
 DEFAULT_POLL_TIMEOUT_S = 240.0
 DEFAULT_TASK_QUERY_TIMEOUT_S = 30.0
+# DashScope rate-limits per account; much higher fan-out mostly buys 429s.
+DEFAULT_MAX_CONCURRENT = 4
+# Local generation cache (opt-in via ALIYUN_IMAGE_CACHE_DIR); oldest entries beyond this are dropped.
+DEFAULT_CACHE_MAX_FILES = 200
+_CACHE_EXTS = (".png", ".jpg", ".webp")
+
+_EXT_MAP = {"png": ".png", "jpg": ".jpg", "jpeg": ".jpg", "webp": ".webp"}
+
+# Built once: json.dumps(..., ensure_ascii=False) would construct a new encoder per call.
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def _json_dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return _JSON_ENCODER.encode(obj).encode("utf-8")
 
-_EXT_RE = re.compile(r"\.(png|jpg|jpeg|webp)(?:$|[?#])", re.IGNORECASE)
+
+def _json_loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 
 @dataclass(frozen=True)
@@ -61,17 +99,23 @@ class AliyunImageAPIError(RuntimeError):
         super().__init__("Aliyun image API error: " + (": ".join(parts) if parts else "unknown"))
 
 
+class AliyunImageCancelled(RuntimeError):
+    """Raised when a caller's cancel event stops a generation while it is polling."""
+
+
 def _parse_kv_file(path: Path) -> dict[str, str]:
     data: dict[str, str] = {}
-    if not path.exists():
+    try:
+        text = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
         return data
-    for line in path.read_text(encoding="utf-8").splitlines():
+    for line in text.splitlines():
         line = line.strip()
-        if not line or line.startswith("#"):
+        if not line or line[0] == "#":
             continue
-        if "=" not in line:
+        key, sep, value = line.partition("=")
+        if not sep:
             continue
-        key, value = line.split("=", 1)
         key = key.strip()
         value = value.strip().strip('"').strip("'")
         data[key] = value
@@ -86,12 +130,32 @@ def load_aliyun_image_config(*, key_file: Path | str = Path("docs/aliyun_image_a
       1) env: ALIYUN_IMAGE_API_KEY / ALIYUN_IMAGE_BASE_URL / ALIYUN_IMAGE_REGION
       2) env: DASHSCOPE_API_KEY (compat)
       3) file: docs/aliyun_image_api-key.md (local-only, should be gitignored)
+
+    Results are cached per (env values, key file mtime/size), so batch runs read the file once.
     """
-    env_key = (os.getenv("ALIYUN_IMAGE_API_KEY") or os.getenv("DASHSCOPE_API_KEY") or "").strip()
-    env_base = (os.getenv("ALIYUN_IMAGE_BASE_URL") or "").strip()
-    env_region = (os.getenv("ALIYUN_IMAGE_REGION") or "").strip()
+    env = os.environ
+    env_key = (env.get("ALIYUN_IMAGE_API_KEY") or env.get("DASHSCOPE_API_KEY") or "").strip()
+    env_base = (env.get("ALIYUN_IMAGE_BASE_URL") or "").strip()
+    env_region = (env.get("ALIYUN_IMAGE_REGION") or "").strip()
 
-    file_cfg = _parse_kv_file(Path(key_file))
+    path = Path(key_file)
+    try:
+        st = path.stat()
+        file_sig: Optional[tuple[int, int]] = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        file_sig = None
+    return _load_aliyun_image_config_cached(str(path), file_sig, env_key, env_base, env_region)
+
+
+@lru_cache(maxsize=4)
+def _load_aliyun_image_config_cached(
+    key_file: str,
+    file_sig: Optional[tuple[int, int]],
+    env_key: str,
+    env_base: str,
+    env_region: str,
+) -> AliyunImageConfig:
+    file_cfg = _parse_kv_file(Path(key_file)) if file_sig is not None else {}
     api_key = (env_key or file_cfg.get("api_key") or "").strip()
     base_url = (env_base or file_cfg.get("base_url") or DEFAULT_BASE_URL).strip().rstrip("/")
     region = (env_region or file_cfg.get("region") or "cn-beijing").strip()
@@ -108,7 +172,7 @@ def load_aliyun_image_config(*, key_file: Path | str = Path("docs/aliyun_image_a
 
 def _raise_api_error(*, url: str, status: Optional[int], raw: bytes, fallback_exc: Exception) -> None:
     try:
-        body = json.loads(raw.decode("utf-8")) if raw else None
+        body = _json_loads(raw) if raw else None
     except Exception:
         body = None
     if isinstance(body, dict):
@@ -123,11 +187,9 @@ def _raise_api_error(*, url: str, status: Optional[int], raw: bytes, fallback_ex
 
 
 def _http_post_json(*, url: str, payload: dict[str, Any], headers: dict[str, str], timeout_s: float) -> dict[str, Any]:
-    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-    req = urllib.request.Request(url, data=data, headers=headers, method="POST")
+    data = _json_dumps(payload)
     try:
-        with urllib.request.urlopen(req, timeout=timeout_s) as resp:
-            raw = resp.read()
+        raw = http_request(method="POST", url=url, body=data, headers=headers, timeout_s=timeout_s)
     except urllib.error.HTTPError as exc:
         raw = exc.read() if hasattr(exc, "read") else b""
         _raise_api_error(url=url, status=getattr(exc, "code", None), raw=raw, fallback_exc=exc)
@@ -135,16 +197,14 @@ def _http_post_json(*, url: str, payload: dict[str, Any], headers: dict[str, str
     except Exception as exc:
         raise RuntimeError(f"Aliyun image request failed: {exc}") from exc
     try:
-        return json.loads(raw.decode("utf-8"))
+        return _json_loads(raw)
     except Exception as exc:
         raise RuntimeError(f"Aliyun image response parse failed: {exc}") from exc
 
 
 def _http_get_json(*, url: str, headers: dict[str, str], timeout_s: float) -> dict[str, Any]:
-    req = urllib.request.Request(url, headers=headers, method="GET")
     try:
-        with urllib.request.urlopen(req, timeout=timeout_s) as resp:
-            raw = resp.read()
+        raw = http_request(method="GET", url=url, body=None, headers=headers, timeout_s=timeout_s)
     except urllib.error.HTTPError as exc:
         raw = exc.read() if hasattr(exc, "read") else b""
         _raise_api_error(url=url, status=getattr(exc, "code", None), raw=raw, fallback_exc=exc)
@@ -152,154 +212,194 @@ def _http_get_json(*, url: str, headers: dict[str, str], timeout_s: float) -> di
     except Exception as exc:
         raise RuntimeError(f"Aliyun image request failed: {exc}") from exc
     try:
-        return json.loads(raw.decode("utf-8"))
+        return _json_loads(raw)
     except Exception as exc:
         raise RuntimeError(f"Aliyun image response parse failed: {exc}") from exc
 
 
-def _download_bytes(*, url: str, timeout_s: float) -> bytes:
+def _download_to_file(*, url: str, dest: Path, timeout_s: float) -> None:
+    """Stream the image straight into `dest` in 64 KiB chunks (no whole-file buffer)."""
     req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0 (redbook_workflow)"}, method="GET")
     try:
-        with urllib.request.urlopen(req, timeout=timeout_s) as resp:
-            return resp.read()
+        with urllib.request.urlopen(req, timeout=timeout_s) as resp, dest.open("wb") as f:
+            shutil.copyfileobj(resp, f, 64 * 1024)
     except Exception as exc:
         raise RuntimeError(f"Aliyun image download failed: {exc}") from exc
 
 
 def _guess_ext(url: str) -> str:
-    m = _EXT_RE.search(url or "")
-    if not m:
-        return ".png"
-    ext = m.group(1).lower()
-    if ext == "jpeg":
-        ext = "jpg"
-    return f".{ext}"
-
-
-def _extract_sync_image_url(resp: dict[str, Any]) -> str:
-    output = resp.get("output")
-    if isinstance(output, dict):
-        choices = output.get("choices")
-        if isinstance(choices, list) and choices:
-            message = (choices[0] or {}).get("message")
-            if isinstance(message, dict):
-                content = message.get("content")
-                if isinstance(content, list) and content:
-                    first = content[0]
-                    if isinstance(first, dict):
-                        image_url = first.get("image") or first.get("url")
-                        if isinstance(image_url, str) and image_url.strip():
-                            return image_url.strip()
+    path = urllib.parse.urlsplit(url or "").path
+    return _EXT_MAP.get(path.rpartition(".")[2].lower(), ".png")
+
+
+def _reserve_new_file(dest_dir: Path, stem: str, ext: str) -> Path:
+    """Create an empty `<stem><ext>`, adding `_1`, `_2`, ... if generations land in the same second."""
+    for n in range(1000):
+        out_path = dest_dir / (f"{stem}{ext}" if n == 0 else f"{stem}_{n}{ext}")
+        try:
+            out_path.open("xb").close()
+        except FileExistsError:
+            continue
+        return out_path
+    raise RuntimeError(f"Aliyun image output name exhausted: {dest_dir / stem}{ext}")
+
+
+def _generation_cache_key(*parts: str) -> str:
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _link_or_copy(src: Path, dest: Path) -> None:
+    """Place `src` at `dest` (replacing it), as a hard link when the filesystem allows."""
+    tmp = dest.with_name(dest.name + ".tmp")
+    try:
+        tmp.unlink(missing_ok=True)
+        os.link(src, tmp)
+        os.replace(tmp, dest)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        shutil.copyfile(src, dest)
+
+
+def _cache_lookup(cache_dir: Path, key: str) -> Optional[Path]:
+    for ext in _CACHE_EXTS:
+        cached = cache_dir / f"{key}{ext}"
+        if cached.is_file():
+            os.utime(cached)  # mark as recently used for the sweep
+            return cached
+    return None
+
+
+def _cache_store(cache_dir: Path, key: str, src: Path, *, max_files: int) -> None:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    _link_or_copy(src, cache_dir / f"{key}{src.suffix}")
+    with os.scandir(cache_dir) as it:
+        entries = [e for e in it if e.is_file() and e.name.endswith(_CACHE_EXTS)]
+    if len(entries) <= max_files:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime_ns)
+    for e in entries[: len(entries) - max_files]:
+        try:
+            os.unlink(e.path)
+        except OSError:
+            pass
+
+
+# Shape mismatches anywhere along a lookup path (missing key, empty list, None, wrong type).
+_SHAPE_ERRORS = (KeyError, IndexError, TypeError, AttributeError)
+_TERMINAL_TASK_STATUSES = frozenset({"SUCCEEDED", "FAILED", "CANCELED"})
+
+
+def _extract_sync_image_urls(resp: dict[str, Any]) -> list[str]:
+    try:
+        choices = resp["output"]["choices"]
+    except _SHAPE_ERRORS:
+        choices = None
+    urls: list[str] = []
+    for choice in choices if isinstance(choices, list) else ():
+        try:
+            content = choice["message"]["content"]
+        except _SHAPE_ERRORS:
+            continue
+        for item in content if isinstance(content, list) else ():
+            try:
+                url = (item.get("image") or item.get("url")).strip()
+            except _SHAPE_ERRORS:
+                continue
+            if url:
+                urls.append(url)
+    if urls:
+        return urls
     raise RuntimeError("Aliyun image response missing image url")
 
 
 def _extract_task_id(resp: dict[str, Any]) -> str:
-    output = resp.get("output")
-    if isinstance(output, dict):
-        task_id = output.get("task_id")
-        if isinstance(task_id, str) and task_id.strip():
-            return task_id.strip()
+    try:
+        task_id = resp["output"]["task_id"].strip()
+    except _SHAPE_ERRORS:
+        task_id = ""
+    if task_id:
+        return task_id
     raise RuntimeError("Aliyun async response missing task_id")
 
 
 def _extract_task_status(resp: dict[str, Any]) -> str:
-    output = resp.get("output")
-    if isinstance(output, dict):
-        status = output.get("task_status")
-        if isinstance(status, str) and status.strip():
-            return status.strip()
-    return ""
-
-
-def _extract_task_image_url(resp: dict[str, Any]) -> str:
-    output = resp.get("output")
-    if isinstance(output, dict):
-        results = output.get("results")
-        if isinstance(results, list) and results:
-            first = results[0]
-            if isinstance(first, dict):
-                url = first.get("url")
-                if isinstance(url, str) and url.strip():
-                    return url.strip()
-    # Some tasks may return multimodal output on success.
-    return _extract_sync_image_url(resp)
+    try:
+        return resp["output"]["task_status"].strip()
+    except _SHAPE_ERRORS:
+        return ""
 
 
-def _is_wan26_model(model_name: str) -> bool:
-    return (model_name or "").strip().lower().startswith("wan2.6")
+def _extract_task_image_urls(resp: dict[str, Any]) -> list[str]:
+    try:
+        results = resp["output"]["results"]
+    except _SHAPE_ERRORS:
+        results = None
+    urls: list[str] = []
+    for item in results if isinstance(results, list) else ():
+        try:
+            url = item["url"].strip()
+        except _SHAPE_ERRORS:
+            continue
+        if url:
+            urls.append(url)
+    # Some tasks may return multimodal output on success.
+    return urls or _extract_sync_image_urls(resp)
 
 
-def _is_text2image_async_model(model_name: str) -> bool:
-    """
-    Old protocol is required for wan2.5 and earlier models (and some legacy wanx).
-    """
-    m = (model_name or "").strip().lower()
-    if m.startswith("wan2.") and not m.startswith("wan2.6"):
-        return True
-    if m.startswith("wanx") or m.startswith("wanx-"):
-        return True
-    return False
+@dataclass(frozen=True)
+class _ModelTraits:
+    is_wan26: bool
+    is_text2image_async: bool
+    supports_negative_prompt: bool
 
 
-def _supports_negative_prompt(model_name: str) -> bool:
+@lru_cache(maxsize=32)
+def _model_traits(model_name: str) -> _ModelTraits:
     """
-    Not all Aliyun/Bailian image models accept negative_prompt.
+    Classify a model name once per process.
 
-    - z-image docs don't list negative_prompt, so we avoid sending it.
-    - qwen-image / wan2.6 docs support it.
+    - is_wan26: wan2.6+ (image-generation protocol, defaults to n=4).
+    - is_text2image_async: old text2image protocol is required for wan2.5 and earlier
+      models (and some legacy wanx).
+    - supports_negative_prompt: not all Aliyun/Bailian image models accept it; z-image docs
+      don't list negative_prompt, so we avoid sending it. qwen-image / wan2.6 docs support it.
     """
     m = (model_name or "").strip().lower()
-    if m.startswith("z-image"):
-        return False
-    return True
-
-
-def _call_multimodal_generation_sync(
-    *,
-    cfg: AliyunImageConfig,
-    model_name: str,
-    prompt: str,
-    size_value: str,
-    timeout_s: float,
-    prompt_extend: bool,
-    watermark: bool,
-    negative_prompt: str,
-) -> dict[str, Any]:
-    url = f"{cfg.base_url}/api/v1/services/aigc/multimodal-generation/generation"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {cfg.api_key}",
-    }
-
-    parameters: dict[str, Any] = {
-        "size": size_value,
-        "prompt_extend": bool(prompt_extend),
-        "watermark": bool(watermark),
-    }
-    # Wan2.6 默认 n=4；这里强制 n=1，避免多出 3 张图的时间与费用。
-    if _is_wan26_model(model_name):
-        parameters["n"] = 1
-    if negative_prompt and _supports_negative_prompt(model_name):
-        parameters["negative_prompt"] = negative_prompt
-
-    payload: dict[str, Any] = {
-        "model": model_name,
-        "input": {
-            "messages": [
-                {
-                    "role": "user",
-                    "content": [{"text": prompt}],
-                }
-            ]
-        },
-        "parameters": parameters,
-    }
-    return _http_post_json(url=url, payload=payload, headers=headers, timeout_s=timeout_s)
+    is_wan26 = m.startswith("wan2.6")
+    return _ModelTraits(
+        is_wan26=is_wan26,
+        is_text2image_async=(m.startswith("wan2.") and not is_wan26) or m.startswith("wanx"),
+        supports_negative_prompt=not m.startswith("z-image"),
+    )
 
 
-def _call_wan26_generation_async(
+@dataclass(frozen=True)
+class _Protocol:
+    path: str
+    async_mode: bool  # sends X-DashScope-Async: enable and returns a task_id
+    prompt_input: bool  # input={"prompt": ...} instead of input={"messages": [...]}
+
+
+_PROTOCOLS = {
+    # Qwen-image / z-image / Wan2.6 sync.
+    "multimodal_generation_sync": _Protocol(
+        "/api/v1/services/aigc/multimodal-generation/generation", async_mode=False, prompt_input=False
+    ),
+    # Wan2.6+ async (image-generation task).
+    "wan26_generation_async": _Protocol(
+        "/api/v1/services/aigc/image-generation/generation", async_mode=True, prompt_input=False
+    ),
+    # Old protocol (wan2.5 and earlier, some legacy models).
+    "text2image_synthesis_async": _Protocol(
+        "/api/v1/services/aigc/text2image/image-synthesis", async_mode=True, prompt_input=True
+    ),
+}
+
+
+def _call_dashscope(
     *,
     cfg: AliyunImageConfig,
+    protocol: str,
     model_name: str,
     prompt: str,
     size_value: str,
@@ -307,81 +407,40 @@ def _call_wan26_generation_async(
     prompt_extend: bool,
     watermark: bool,
     negative_prompt: str,
+    n: int = 1,
 ) -> dict[str, Any]:
-    """
-    Wan2.6+ async endpoint:
-      POST {base_url}/api/v1/services/aigc/image-generation/generation
-      Header: X-DashScope-Async: enable
-    """
-    url = f"{cfg.base_url}/api/v1/services/aigc/image-generation/generation"
+    """POST one create request for `protocol` (a `_PROTOCOLS` key)."""
+    proto = _PROTOCOLS[protocol]
     headers = {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {cfg.api_key}",
-        "X-DashScope-Async": "enable",
     }
+    if proto.async_mode:
+        headers["X-DashScope-Async"] = "enable"
 
     parameters: dict[str, Any] = {
         "size": size_value,
-        "n": 1,
-        "prompt_extend": bool(prompt_extend),
-        "watermark": bool(watermark),
-    }
-    if negative_prompt and _supports_negative_prompt(model_name):
-        parameters["negative_prompt"] = negative_prompt
-
-    payload: dict[str, Any] = {
-        "model": model_name,
-        "input": {
-            "messages": [
-                {
-                    "role": "user",
-                    "content": [{"text": prompt}],
-                }
-            ]
-        },
-        "parameters": parameters,
-    }
-    return _http_post_json(url=url, payload=payload, headers=headers, timeout_s=timeout_s)
-
-
-def _call_text2image_synthesis_async(
-    *,
-    cfg: AliyunImageConfig,
-    model_name: str,
-    prompt: str,
-    size_value: str,
-    timeout_s: float,
-    prompt_extend: bool,
-    watermark: bool,
-    negative_prompt: str,
-) -> dict[str, Any]:
-    """
-    Old protocol (wan2.5 and earlier, some legacy models):
-      POST {base_url}/api/v1/services/aigc/text2image/image-synthesis
-      Header: X-DashScope-Async: enable
-    """
-    url = f"{cfg.base_url}/api/v1/services/aigc/text2image/image-synthesis"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {cfg.api_key}",
-        "X-DashScope-Async": "enable",
+        "prompt_extend": prompt_extend,
+        "watermark": watermark,
     }
+    # Wan2.6 默认 n=4；这里显式传 n（默认 1），避免多出 3 张图的时间与费用。
+    # 同步 multimodal 接口只有 wan2.6 接受 n。
+    if proto.async_mode or _model_traits(model_name).is_wan26:
+        parameters["n"] = n
+
+    if proto.prompt_input:
+        input_obj: dict[str, Any] = {"prompt": prompt}
+        if negative_prompt:
+            input_obj["negative_prompt"] = negative_prompt
+    else:
+        input_obj = {"messages": [{"role": "user", "content": [{"text": prompt}]}]}
+        if negative_prompt:
+            parameters["negative_prompt"] = negative_prompt
 
-    input_obj: dict[str, Any] = {"prompt": prompt}
-    if negative_prompt and _supports_negative_prompt(model_name):
-        input_obj["negative_prompt"] = negative_prompt
-
-    payload: dict[str, Any] = {
-        "model": model_name,
-        "input": input_obj,
-        "parameters": {
-            "size": size_value,
-            "n": 1,
-            "prompt_extend": bool(prompt_extend),
-            "watermark": bool(watermark),
-        },
-    }
-    return _http_post_json(url=url, payload=payload, headers=headers, timeout_s=timeout_s)
+    payload: dict[str, Any] = {"model": model_name, "input": input_obj, "parameters": parameters}
+    return _http_post_json(
+        url=f"{cfg.base_url}{proto.path}", payload=payload, headers=headers, timeout_s=timeout_s
+    )
 
 
 def _poll_task_result(
@@ -389,31 +448,54 @@ def _poll_task_result(
     cfg: AliyunImageConfig,
     task_id: str,
     poll_timeout_s: float,
-    poll_interval_s: float,
+    poll_max_interval_s: float,
     query_timeout_s: float,
+    poll_initial_delay_s: float = DEFAULT_POLL_INITIAL_DELAY_S,
+    poll_backoff: float = DEFAULT_POLL_BACKOFF,
+    cancel: Optional[threading.Event] = None,
 ) -> dict[str, Any]:
+    """
+    Poll the task until it reaches a terminal status.
+
+    The delay between polls starts at `poll_initial_delay_s` and grows by `poll_backoff`
+    (with ±10% jitter) up to `poll_max_interval_s`. It drops back to the initial delay when the
+    task moves to RUNNING, since the result is usually close by then. Setting `cancel`
+    stops the loop at the next wake-up with AliyunImageCancelled.
+    """
     url = f"{cfg.base_url}/api/v1/tasks/{task_id}"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {cfg.api_key}",
-    }
+    headers = {"Authorization": f"Bearer {cfg.api_key}"}
 
-    deadline = time.time() + max(1.0, poll_timeout_s)
+    min_delay = max(0.2, min(poll_initial_delay_s, poll_max_interval_s))
+    max_delay = max(min_delay, poll_max_interval_s)
+    delay = min_delay
+    deadline = time.monotonic() + max(1.0, poll_timeout_s)
     last_status = ""
     while True:
-        if time.time() > deadline:
+        if cancel is not None and cancel.is_set():
+            raise AliyunImageCancelled(f"Aliyun image task poll cancelled (task_id={task_id})")
+        if time.monotonic() > deadline:
             raise TimeoutError(
                 f"Aliyun image task poll timed out after {poll_timeout_s}s "
                 f"(task_id={task_id}, last_status={last_status})"
             )
+        started = time.monotonic()
         resp = _http_get_json(url=url, headers=headers, timeout_s=query_timeout_s)
-        last_status = _extract_task_status(resp)
-        if last_status in ("SUCCEEDED", "FAILED", "CANCELED"):
+        status = _extract_task_status(resp)
+        if status in _TERMINAL_TASK_STATUSES:
             return resp
-        time.sleep(max(0.2, poll_interval_s))
+        if status == "RUNNING" and last_status != "RUNNING":
+            delay = min_delay
+        last_status = status
+        # The GET itself counts towards the interval, so the cadence matches `delay`.
+        sleep_s = max(0.1, delay * random.uniform(0.9, 1.1) - (time.monotonic() - started))
+        if cancel is not None:
+            cancel.wait(sleep_s)
+        else:
+            time.sleep(sleep_s)
+        delay = min(delay * max(1.0, poll_backoff), max_delay)
 
 
-def generate_aliyun_image(
+def generate_aliyun_images_same_prompt(
     *,
     post_id: str,
     prompt: str,
@@ -425,9 +507,20 @@ def generate_aliyun_image(
     negative_prompt: Optional[str] = None,
     prompt_extend: Optional[bool] = None,
     watermark: Optional[bool] = None,
-) -> AliyunImageResult:
+    n: int = 1,
+    cancel: Optional[threading.Event] = None,
+    use_cache: bool = True,
+) -> list[AliyunImageResult]:
     """
-    Generate ONE image via 阿里云百炼（DashScope）并下载落盘。
+    Generate `n` images for ONE prompt via 阿里云百炼（DashScope）并下载落盘。
+
+    Wan models take `parameters.n`, so all images come from a single task (one create
+    request + one poll loop); other models only accept n=1 and fall back to separate
+    requests. Downloads run concurrently.
+
+    With ALIYUN_IMAGE_CACHE_DIR set, an n=1 call reuses a cached image for the same
+    model/size/prompt settings; n>1 always generates. Callers looping n=1 calls over one
+    prompt for distinct images should pass `use_cache=False`.
 
     Notes:
     - 文生图 API 返回的是图片 URL（通常 24h 有效），必须下载才能本地保存用于上传小红书。
@@ -452,9 +545,77 @@ def generate_aliyun_image(
 
     if negative_prompt is None:
         negative_prompt = (os.getenv("ALIYUN_IMAGE_NEGATIVE_PROMPT") or "").strip()
+    prompt_extend = bool(prompt_extend)
+    watermark = bool(watermark)
+    # Decided once per call; _call_dashscope sends whatever negative_prompt it gets.
+    traits = _model_traits(model_name)
+    request_negative_prompt = negative_prompt if traits.supports_negative_prompt else ""
+
+    n = max(1, int(n))
+    cache_dir_env = (os.getenv("ALIYUN_IMAGE_CACHE_DIR") or "").strip()
+    cache_dir = Path(cache_dir_env) if cache_dir_env and use_cache and n == 1 else None
+    cache_key = _generation_cache_key(
+        model_name, size_value, prompt, request_negative_prompt, str(prompt_extend), str(watermark)
+    )
+    if cache_dir is not None:
+        cached = _cache_lookup(cache_dir, cache_key)
+        if cached is not None:
+            dest_dir.mkdir(parents=True, exist_ok=True)
+            ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+            out_path = _reserve_new_file(dest_dir, f"ai_aliyun_{ts}", cached.suffix)
+            _link_or_copy(cached, out_path)
+            return [
+                AliyunImageResult(
+                    path=out_path,
+                    meta={
+                        "mode": "aliyun_image",
+                        "provider": "aliyun",
+                        "post_id": post_id,
+                        "region": cfg.region,
+                        "model": model_name,
+                        "size": size_value,
+                        "prompt": prompt,
+                        "prompt_extend": prompt_extend,
+                        "watermark": watermark,
+                        "negative_prompt": negative_prompt,
+                        "method": "cache",
+                        "cache_hit": True,
+                        "cache_key": cache_key,
+                        "src_url": str(cached),
+                        "downloaded_path": str(out_path),
+                        "downloaded_at": datetime.now(timezone.utc).isoformat(),
+                    },
+                )
+            ]
+    if n > 1 and not (traits.is_wan26 or traits.is_text2image_async):
+        single = dict(
+            post_id=post_id,
+            prompt=prompt,
+            dest_dir=dest_dir,
+            timeout_s=timeout_s,
+            download_timeout_s=download_timeout_s,
+            model=model_name,
+            size=size_value,
+            negative_prompt=negative_prompt,
+            prompt_extend=prompt_extend,
+            watermark=watermark,
+            cancel=cancel,
+            use_cache=False,  # a cache hit would hand back the same image n times
+        )
+        return [generate_aliyun_images_same_prompt(**single)[0] for _ in range(n)]
 
     call_mode = (os.getenv("ALIYUN_IMAGE_CALL_MODE") or "auto").strip().lower()
-    poll_interval_s = float(os.getenv("ALIYUN_IMAGE_POLL_INTERVAL_S") or DEFAULT_POLL_INTERVAL_S)
+    fixed_interval = (os.getenv("ALIYUN_IMAGE_POLL_INTERVAL_S") or "").strip()
+    if fixed_interval:
+        # An explicit interval keeps its original meaning: poll every N seconds, no backoff.
+        poll_initial_delay_s = poll_max_interval_s = float(fixed_interval)
+    else:
+        poll_initial_delay_s = float(
+            os.getenv("ALIYUN_IMAGE_POLL_INITIAL_DELAY_S") or DEFAULT_POLL_INITIAL_DELAY_S
+        )
+        poll_max_interval_s = float(
+            os.getenv("ALIYUN_IMAGE_POLL_MAX_INTERVAL_S") or DEFAULT_POLL_MAX_INTERVAL_S
+        )
     poll_timeout_s = float(os.getenv("ALIYUN_IMAGE_POLL_TIMEOUT_S") or max(timeout_s, DEFAULT_POLL_TIMEOUT_S))
     query_timeout_s = float(
         os.getenv("ALIYUN_IMAGE_TASK_QUERY_TIMEOUT_S") or min(DEFAULT_TASK_QUERY_TIMEOUT_S, timeout_s)
@@ -464,111 +625,88 @@ def generate_aliyun_image(
         msg = str(err or "").lower()
         return "does not support synchronous calls" in msg or "do not support synchronous calls" in msg
 
+    def _create(protocol: str) -> dict[str, Any]:
+        return _call_dashscope(
+            cfg=cfg,
+            protocol=protocol,
+            model_name=model_name,
+            prompt=prompt,
+            size_value=size_value,
+            timeout_s=timeout_s,
+            prompt_extend=prompt_extend,
+            watermark=watermark,
+            negative_prompt=request_negative_prompt,
+            n=n,
+        )
+
     method = "multimodal_generation_sync"
     task_id: Optional[str] = None
     create_resp: dict[str, Any]
     task_resp: Optional[dict[str, Any]] = None
 
     if call_mode == "auto":
-        if _is_text2image_async_model(model_name):
+        if traits.is_text2image_async:
             call_mode = "async"
         else:
             call_mode = "sync"
 
-    if call_mode in ("async", "task", "text2image"):
-        if _is_wan26_model(model_name):
-            method = "wan26_generation_async"
-            create_resp = _call_wan26_generation_async(
-                cfg=cfg,
-                model_name=model_name,
-                prompt=prompt,
-                size_value=size_value,
-                timeout_s=timeout_s,
-                prompt_extend=bool(prompt_extend),
-                watermark=bool(watermark),
-                negative_prompt=negative_prompt or "",
-            )
+    async_protocol = "wan26_generation_async" if traits.is_wan26 else "text2image_synthesis_async"
+    use_task = call_mode in ("async", "task", "text2image")
+    if use_task:
+        method = async_protocol
+    else:
+        try:
+            create_resp = _create(method)
+        except AliyunImageAPIError as exc:
+            # 某些账号/模型可能不支持同步：自动降级为异步（旧协议 or wan2.6 新协议）
+            if not _sync_not_supported(exc):
+                raise
+            method = f"{async_protocol}_fallback"
+            use_task = True
         else:
-            method = "text2image_synthesis_async"
-            create_resp = _call_text2image_synthesis_async(
-                cfg=cfg,
-                model_name=model_name,
-                prompt=prompt,
-                size_value=size_value,
-                timeout_s=timeout_s,
-                prompt_extend=bool(prompt_extend),
-                watermark=bool(watermark),
-                negative_prompt=negative_prompt or "",
-            )
+            image_urls = _extract_sync_image_urls(create_resp)
+
+    if use_task:
+        create_resp = _create(async_protocol)
         task_id = _extract_task_id(create_resp)
         task_resp = _poll_task_result(
             cfg=cfg,
             task_id=task_id,
             poll_timeout_s=poll_timeout_s,
-            poll_interval_s=poll_interval_s,
+            poll_max_interval_s=poll_max_interval_s,
             query_timeout_s=query_timeout_s,
+            poll_initial_delay_s=poll_initial_delay_s,
+            cancel=cancel,
         )
-        image_url = _extract_task_image_url(task_resp)
-    else:
-        try:
-            create_resp = _call_multimodal_generation_sync(
-                cfg=cfg,
-                model_name=model_name,
-                prompt=prompt,
-                size_value=size_value,
-                timeout_s=timeout_s,
-                prompt_extend=bool(prompt_extend),
-                watermark=bool(watermark),
-                negative_prompt=negative_prompt or "",
-            )
-        except AliyunImageAPIError as exc:
-            # 某些账号/模型可能不支持同步：自动降级为异步（旧协议 or wan2.6 新协议）
-            if _sync_not_supported(exc):
-                if _is_wan26_model(model_name):
-                    method = "wan26_generation_async_fallback"
-                    create_resp = _call_wan26_generation_async(
-                        cfg=cfg,
-                        model_name=model_name,
-                        prompt=prompt,
-                        size_value=size_value,
-                        timeout_s=timeout_s,
-                        prompt_extend=bool(prompt_extend),
-                        watermark=bool(watermark),
-                        negative_prompt=negative_prompt or "",
-                    )
-                else:
-                    method = "text2image_synthesis_async_fallback"
-                    create_resp = _call_text2image_synthesis_async(
-                        cfg=cfg,
-                        model_name=model_name,
-                        prompt=prompt,
-                        size_value=size_value,
-                        timeout_s=timeout_s,
-                        prompt_extend=bool(prompt_extend),
-                        watermark=bool(watermark),
-                        negative_prompt=negative_prompt or "",
-                    )
-                task_id = _extract_task_id(create_resp)
-                task_resp = _poll_task_result(
-                    cfg=cfg,
-                    task_id=task_id,
-                    poll_timeout_s=poll_timeout_s,
-                    poll_interval_s=poll_interval_s,
-                    query_timeout_s=query_timeout_s,
-                )
-                image_url = _extract_task_image_url(task_resp)
-            else:
-                raise
-        else:
-            image_url = _extract_sync_image_url(create_resp)
-
-    data = _download_bytes(url=image_url, timeout_s=download_timeout_s)
+        image_urls = _extract_task_image_urls(task_resp)
 
+    image_urls = image_urls[:n]
     dest_dir.mkdir(parents=True, exist_ok=True)
     ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-    ext = _guess_ext(image_url)
-    out_path = dest_dir / f"ai_aliyun_{ts}{ext}"
-    out_path.write_bytes(data)
+    out_paths = [_reserve_new_file(dest_dir, f"ai_aliyun_{ts}", _guess_ext(url)) for url in image_urls]
+    try:
+        if len(image_urls) == 1:
+            _download_to_file(url=image_urls[0], dest=out_paths[0], timeout_s=download_timeout_s)
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(image_urls), DEFAULT_MAX_CONCURRENT)) as pool:
+                list(
+                    pool.map(
+                        lambda url, dest: _download_to_file(url=url, dest=dest, timeout_s=download_timeout_s),
+                        image_urls,
+                        out_paths,
+                    )
+                )
+    except BaseException:
+        for out_path in out_paths:
+            out_path.unlink(missing_ok=True)
+        raise
+    downloaded_at = datetime.now(timezone.utc).isoformat()
+    if cache_dir is not None:
+        max_files = int(os.getenv("ALIYUN_IMAGE_CACHE_MAX_FILES") or DEFAULT_CACHE_MAX_FILES)
+        try:
+            _cache_store(cache_dir, cache_key, out_paths[0], max_files=max(1, max_files))
+        except OSError:
+            pass  # the cache is best-effort; the generated image is already in place
 
     meta: dict[str, Any] = {
         "mode": "aliyun_image",
@@ -578,20 +716,97 @@ def generate_aliyun_image(
         "model": model_name,
         "size": size_value,
         "prompt": prompt,
-        "prompt_extend": bool(prompt_extend),
-        "watermark": bool(watermark),
+        "prompt_extend": prompt_extend,
+        "watermark": watermark,
         "negative_prompt": negative_prompt,
         "call_mode": call_mode,
         "method": method,
         "task_id": task_id,
-        "src_url": image_url,
-        "downloaded_path": str(out_path),
-        "downloaded_at": datetime.now(timezone.utc).isoformat(),
         "request_id": (create_resp or {}).get("request_id"),
         "usage": (create_resp or {}).get("usage"),
     }
     if task_resp is not None:
         meta["task"] = {"status": _extract_task_status(task_resp)}
 
-    return AliyunImageResult(path=out_path, meta=meta)
+    return [
+        AliyunImageResult(
+            path=out_path,
+            meta={
+                **meta,
+                "src_url": url,
+                "downloaded_path": str(out_path),
+                "downloaded_at": downloaded_at,
+                **({"index": index, "n": len(image_urls)} if len(image_urls) > 1 else {}),
+            },
+        )
+        for index, (url, out_path) in enumerate(zip(image_urls, out_paths))
+    ]
+
+
+def generate_aliyun_image(
+    *,
+    post_id: str,
+    prompt: str,
+    dest_dir: Path,
+    timeout_s: Optional[float] = None,
+    download_timeout_s: Optional[float] = None,
+    model: Optional[str] = None,
+    size: Optional[str] = None,
+    negative_prompt: Optional[str] = None,
+    prompt_extend: Optional[bool] = None,
+    watermark: Optional[bool] = None,
+    cancel: Optional[threading.Event] = None,
+    use_cache: bool = True,
+) -> AliyunImageResult:
+    """Generate ONE image via 阿里云百炼（DashScope）并下载落盘（见 generate_aliyun_images_same_prompt）。"""
+    return generate_aliyun_images_same_prompt(
+        post_id=post_id,
+        prompt=prompt,
+        dest_dir=dest_dir,
+        timeout_s=timeout_s,
+        download_timeout_s=download_timeout_s,
+        model=model,
+        size=size,
+        negative_prompt=negative_prompt,
+        prompt_extend=prompt_extend,
+        watermark=watermark,
+        cancel=cancel,
+        use_cache=use_cache,
+    )[0]
+
+
+async def generate_aliyun_image_async(**kwargs: Any) -> AliyunImageResult:
+    """
+    Awaitable `generate_aliyun_image` (same keyword arguments and result).
+
+    The blocking HTTP/poll/download flow runs in a worker thread, so several generations
+    can overlap on one event loop.
+    """
+    return await asyncio.to_thread(generate_aliyun_image, **kwargs)
+
+
+async def generate_aliyun_images_async(
+    jobs: list[dict[str, Any]],
+    *,
+    max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+) -> list[AliyunImageResult | BaseException]:
+    """
+    Run several `generate_aliyun_image` calls concurrently (each job = its keyword arguments).
+
+    At most `max_concurrent` generations are in flight. Results keep the order of `jobs`;
+    a failed job yields its exception instead of cancelling the others. Cancelling the
+    batch itself stops in-flight polls via a shared cancel event.
+    """
+    sem = asyncio.Semaphore(max(1, max_concurrent))
+    cancel = threading.Event()
 
+    async def _one(job: dict[str, Any]) -> AliyunImageResult:
+        async with sem:
+            return await generate_aliyun_image_async(**{"cancel": cancel, **job})
+
+    try:
+        return list(await asyncio.gather(*(_one(job) for job in jobs), return_exceptions=True))
+    except asyncio.CancelledError:
+        # Worker threads can't be cancelled; make their poll loops exit instead.
+        cancel.set()
+        raise
@@ -1,16 +1,29 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import re
+import shutil
+import threading
 import time
+import urllib.error
 import urllib.parse
-import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
+from src.images.http_pool import http_fetch, http_request
+
+try:  # optional: faster parsing of Pexels search responses
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
 PEXELS_BASE_URL = "https://api.pexels.com"
 DEFAULT_PROVIDER = "pexels"
 DEFAULT_QUERY = "lifestyle"
@@ -19,14 +32,24 @@ DEFAULT_MAX_CANDIDATES = 30
 DEFAULT_ORIENTATION = "portrait"
 DEFAULT_IMAGE_COUNT = 3
 DEFAULT_MIN_SCORE = 0.12
+DEFAULT_MIN_AREA = 500 * 500
+DEFAULT_DOWNLOAD_WORKERS = 8
 MAX_IMAGE_COUNT = 18
+# Resolution bonus in _relevance_score: up to _AREA_BONUS_WEIGHT, reached at _AREA_BONUS_FULL px.
+_AREA_BONUS_FULL = 2000 * 2000
+_AREA_BONUS_WEIGHT = 0.15
+_MAX_RELEVANCE_SCORE = 1.0 + _AREA_BONUS_WEIGHT
+# Local search/download cache (opt-in via IMAGE_CACHE_DIR); fresh search hits skip the API entirely.
+DEFAULT_CACHE_TTL_S = 3600.0
 
 _TOKEN_RE = re.compile(r"[a-z0-9]+|[\u4e00-\u9fff]+", re.IGNORECASE)
-_CJK_RE = re.compile(r"^[\u4e00-\u9fff]+$")
+_EXT_MAP = {"jpg": ".jpg", "jpeg": ".jpg", "png": ".png", "webp": ".webp"}
 _HASHTAG_RE = re.compile(r"#\S+")
 _URL_RE = re.compile(r"https?://\S+", re.IGNORECASE)
 _EN_TOKEN_RE = re.compile(r"[a-zA-Z]+")
-_EN_STOPWORDS = {
+_LATIN_RE = re.compile(r"[a-zA-Z]")
+_WS_RE = re.compile(r"\s+")
+_EN_STOPWORDS = frozenset({
     "a",
     "an",
     "and",
@@ -66,7 +89,7 @@ _EN_STOPWORDS = {
     "with",
     "what",
     "why",
-}
+})
 _ENTITY_MAP = {
     "中国": "China",
     "美国": "USA",
@@ -90,9 +113,29 @@ _ENTITY_MAP = {
     "朝鲜": "North Korea",
     "印度": "India",
 }
-
-
-@dataclass(frozen=True)
+# (keywords, English hint) in output order: entities first, then topic categories.
+# Keywords are matched against the upper-cased query, so "AI" also covers "ai".
+_HINT_TABLE: tuple[tuple[tuple[str, ...], str], ...] = (
+    *(((cn,), en) for cn, en in _ENTITY_MAP.items()),
+    (("美国", "美國"), "USA"),
+    (("时政", "時政", "政治"), "politics"),
+    (("大选", "大選", "选举", "選舉"), "election"),
+    (("国会", "國會"), "congress"),
+    (("外交",), "diplomacy"),
+    (("经济", "經濟", "财经", "財經"), "economy"),
+    (("科技", "AI", "人工智能"), "technology"),
+    (("国际", "國際"), "international"),
+    (("军事", "軍事"), "military"),
+    (("能源", "石油", "油价", "油價"), "oil"),
+    (("工业", "工業"), "industry"),
+    (("制造", "製造"), "manufacturing"),
+    (("金融",), "finance"),
+)
+# Flattened once so the scan is a run of plain `in` tests with no per-row generator.
+_HINT_PAIRS: tuple[tuple[str, str], ...] = tuple((kw, en) for keywords, en in _HINT_TABLE for kw in keywords)
+
+
+@dataclass(frozen=True, slots=True)
 class ImageItem:
     provider: str
     id: str
@@ -106,6 +149,42 @@ class ImageItem:
     alt: Optional[str] = None
 
 
+@dataclass(frozen=True)
+class _ImageSettings:
+    provider: str
+    timeout_s: Optional[float]
+    max_candidates: Optional[int]
+    orientation: str
+    default_query: str
+
+
+_SETTINGS_ENV = (
+    "IMAGE_PROVIDER",
+    "IMAGE_TIMEOUT_S",
+    "IMAGE_MAX_CANDIDATES",
+    "IMAGE_ORIENTATION",
+    "IMAGE_QUERY_DEFAULT",
+)
+
+
+def _image_settings() -> _ImageSettings:
+    """IMAGE_* env settings, parsed once per distinct set of raw env values."""
+    env = os.environ
+    return _image_settings_cached(tuple(env.get(name) or "" for name in _SETTINGS_ENV))
+
+
+@lru_cache(maxsize=4)
+def _image_settings_cached(raw: tuple[str, ...]) -> _ImageSettings:
+    provider, timeout_s, max_candidates, orientation, default_query = raw
+    return _ImageSettings(
+        provider=provider.strip().lower(),
+        timeout_s=float(timeout_s) if timeout_s else None,
+        max_candidates=int(max_candidates) if max_candidates else None,
+        orientation=(orientation or DEFAULT_ORIENTATION).strip().lower(),
+        default_query=default_query.strip() or DEFAULT_QUERY,
+    )
+
+
 class ImageGenerationAbandoned(RuntimeError):
     """
     Raised when an image-generation provider fails repeatedly
@@ -129,15 +208,17 @@ def is_auto_image_enabled() -> bool:
 
 def _parse_kv_file(path: Path) -> dict[str, str]:
     data: dict[str, str] = {}
-    if not path.exists():
+    try:
+        text = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
         return data
-    for line in path.read_text(encoding="utf-8").splitlines():
+    for line in text.splitlines():
         line = line.strip()
-        if not line or line.startswith("#"):
+        if not line or line[0] == "#":
             continue
-        if "=" not in line:
+        k, sep, v = line.partition("=")
+        if not sep:
             continue
-        k, v = line.split("=", 1)
         k = k.strip()
         v = v.strip().strip('"').strip("'")
         data[k] = v
@@ -148,9 +229,32 @@ def _load_pexels_config(
     *,
     key_file: Path | str = Path("docs/pexels_api-key.md"),
 ) -> tuple[str, str]:
-    env_key = os.getenv("PEXELS_API_KEY")
-    env_base = os.getenv("PEXELS_BASE_URL")
-    file_cfg = _parse_kv_file(Path(key_file))
+    """
+    Resolve (api_key, base_url) from env, then the local key file.
+
+    Cached per (env values, key file mtime/size), so the fallback-query loop and batch runs
+    read the file once; editing the file or the env still takes effect on the next call.
+    """
+    env = os.environ
+    path = Path(key_file)
+    try:
+        st = path.stat()
+        file_sig: Optional[tuple[int, int]] = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        file_sig = None
+    return _load_pexels_config_cached(
+        str(path), file_sig, env.get("PEXELS_API_KEY") or "", env.get("PEXELS_BASE_URL") or ""
+    )
+
+
+@lru_cache(maxsize=4)
+def _load_pexels_config_cached(
+    key_file: str,
+    file_sig: Optional[tuple[int, int]],
+    env_key: str,
+    env_base: str,
+) -> tuple[str, str]:
+    file_cfg = _parse_kv_file(Path(key_file)) if file_sig is not None else {}
 
     api_key = (env_key or file_cfg.get("api_key") or "").strip()
     base_url = (env_base or file_cfg.get("base_url") or PEXELS_BASE_URL).strip()
@@ -162,23 +266,24 @@ def _load_pexels_config(
     return api_key, base_url.rstrip("/")
 
 
-def _tokens(text: str) -> set[str]:
+@lru_cache(maxsize=2048)
+def _tokens(text: str) -> frozenset[str]:
+    # Memoized: the same query/alt/url strings are re-tokenized across fallback queries and
+    # the ranking + diversity passes. Frozen so a cached result can't be mutated by a caller.
     text = (text or "").strip().lower()
     if not text:
-        return set()
-    out: set[str] = set()
-    for m in _TOKEN_RE.finditer(text):
-        part = m.group(0)
-        if not part:
-            continue
-        out.add(part)
-        if _CJK_RE.match(part):
+        return frozenset()
+    parts = _TOKEN_RE.findall(text)
+    out = set(parts)
+    for part in parts:
+        # Runs are either all [a-z0-9] or all CJK, so the first char says which.
+        if part[0] >= "\u4e00":
             # Add bigrams for better Chinese fuzzy matching.
-            if len(part) <= 4:
+            n = len(part)
+            if n <= 4:
                 out.update(part)
-            for i in range(len(part) - 1):
-                out.add(part[i : i + 2])
-    return out
+            out.update(part[i : i + 2] for i in range(n - 1))
+    return frozenset(out)
 
 
 def _strip_hashtags(text: str) -> str:
@@ -188,7 +293,7 @@ def _strip_hashtags(text: str) -> str:
 
 
 def _compact_spaces(text: str) -> str:
-    return re.sub(r"\s+", " ", (text or "").strip())
+    return _WS_RE.sub(" ", (text or "").strip())
 
 
 def _strip_urls(text: str) -> str:
@@ -283,30 +388,24 @@ def _compress_english_query(text: str, *, max_words: int = 6) -> str:
     tokens = _english_tokens(text)
     if not tokens:
         return ""
-    filtered = [t for t in tokens if t not in _EN_STOPWORDS and len(t) > 2]
-    if not filtered:
-        filtered = [t for t in tokens if len(t) > 2] or tokens
+    # Filter + dedupe in one pass, stopping as soon as max_words are kept.
     seen: set[str] = set()
     out: list[str] = []
-    for t in filtered:
-        if t in seen:
+    for t in tokens:
+        if len(t) <= 2 or t in _EN_STOPWORDS or t in seen:
             continue
         out.append(t)
         seen.add(t)
         if len(out) >= max_words:
             break
+    if not out:
+        out = _dedupe_tokens([t for t in tokens if len(t) > 2] or tokens)[:max_words]
     return " ".join(out).strip()
 
 
 def _dedupe_tokens(tokens: list[str]) -> list[str]:
-    seen: set[str] = set()
-    out: list[str] = []
-    for t in tokens:
-        if not t or t in seen:
-            continue
-        out.append(t)
-        seen.add(t)
-    return out
+    # dict preserves first-seen order; dedupe happens in C.
+    return [t for t in dict.fromkeys(tokens) if t]
 
 
 def _resolve_image_count(count: Optional[int]) -> int:
@@ -321,18 +420,20 @@ def _resolve_image_count(count: Optional[int]) -> int:
     return max(1, min(int(count), MAX_IMAGE_COUNT))
 
 
-def _item_tokens(item: ImageItem) -> set[str]:
+def _item_tokens(item: ImageItem) -> frozenset[str]:
     tokens = _tokens(item.alt or "")
     if tokens:
         return tokens
     return _tokens(item.page_url or "")
 
 
-def _is_similar_tokens(a: set[str], b: set[str], *, threshold: float = 0.6) -> bool:
+def _is_similar_tokens(a: frozenset[str], b: frozenset[str], *, threshold: float = 0.6) -> bool:
     if not a or not b:
         return False
     min_len = min(len(a), len(b))
-    if min_len < 3:
+    if min_len < 3 or a.isdisjoint(b):
+        # isdisjoint stops at the first shared token and builds no temporary set; most
+        # candidate pairs in an already-diverse pool share nothing.
         return False
     overlap = len(a & b) / min_len
     return overlap >= threshold
@@ -362,10 +463,13 @@ def build_image_query(
         title_norm = _compact_spaces(title_norm.split("｜", 1)[1])
     if "|" in title_norm:
         title_norm = _compact_spaces(title_norm.split("|", 1)[1]) or title_norm
-    if re.search(r"[a-zA-Z]", title_norm):
-        word_count = len(_english_tokens(title_norm))
+    if _LATIN_RE.search(title_norm):
+        word_count = sum(1 for _ in _EN_TOKEN_RE.finditer(title_norm))
         if len(title_norm) > 60 or word_count > 8:
             title_norm = _compress_english_query(title_norm, max_words=6) or title_norm
+    if len(title_norm) >= max_len:
+        # Topics/hint would be cut off by the final truncation anyway.
+        return title_norm[:max_len]
     if title_norm:
         parts.append(title_norm)
 
@@ -394,10 +498,16 @@ def build_image_query(
 
     query = _compact_spaces(" ".join(p for p in parts if p))
     if not query:
-        query = (os.getenv("IMAGE_QUERY_DEFAULT") or DEFAULT_QUERY).strip() or DEFAULT_QUERY
+        query = _image_settings().default_query
     return query if len(query) <= max_len else query[:max_len]
 
 
+def _scan_hint_keywords(q: str) -> list[str]:
+    """English hints whose keywords occur in `q`, in `_HINT_TABLE` order (may repeat; callers dedupe)."""
+    s = q.upper()
+    return [en for kw, en in _HINT_PAIRS if kw in s]
+
+
 def _pexels_query_hint(query: str) -> str:
     """
     Pexels search tends to work better with English keywords. Do a tiny mapping for common
@@ -416,36 +526,9 @@ def _pexels_query_hint(query: str) -> str:
     english_hint = _compress_english_query(q, max_words=6)
     if english_hint:
         tokens.extend(english_hint.split())
-    for cn, en in _ENTITY_MAP.items():
-        if cn in q:
-            _add_token(tokens, en)
-    if "美国" in q or "美國" in q:
-        _add_token(tokens, "USA")
-    if "时政" in q or "時政" in q or "政治" in q:
-        _add_token(tokens, "politics")
-    if "大选" in q or "大選" in q or "选举" in q or "選舉" in q:
-        _add_token(tokens, "election")
-    if "国会" in q or "國會" in q:
-        _add_token(tokens, "congress")
-    if "外交" in q:
-        _add_token(tokens, "diplomacy")
-    if "经济" in q or "經濟" in q or "财经" in q or "財經" in q:
-        _add_token(tokens, "economy")
-    if "科技" in q or "AI" in q.upper() or "人工智能" in q:
-        _add_token(tokens, "technology")
-    if "国际" in q or "國際" in q:
-        _add_token(tokens, "international")
+    for en in _scan_hint_keywords(q):
+        _add_token(tokens, en)
     has_news = "新闻" in q
-    if "军事" in q or "軍事" in q:
-        _add_token(tokens, "military")
-    if "能源" in q or "石油" in q or "油价" in q or "油價" in q:
-        _add_token(tokens, "oil")
-    if "工业" in q or "工業" in q:
-        _add_token(tokens, "industry")
-    if "制造" in q or "製造" in q:
-        _add_token(tokens, "manufacturing")
-    if "金融" in q:
-        _add_token(tokens, "finance")
 
     if not tokens and has_news:
         tokens.append("news")
@@ -457,10 +540,8 @@ def _pexels_query_hint(query: str) -> str:
     return " ".join(tokens[:8]).strip()
 
 
-def _relevance_score(
-    item: ImageItem, query: str, *, query_tokens: Optional[set[str]] = None
-) -> float:
-    q_tokens = query_tokens or _tokens(query)
+def _relevance_score(item: ImageItem, q_tokens: frozenset[str]) -> float:
+    """Score one candidate against pre-tokenized query tokens (callers tokenize the query once)."""
     if not q_tokens:
         return 0.0
     item_text = f"{item.alt or ''} {item.page_url or ''}".lower()
@@ -476,22 +557,39 @@ def _relevance_score(
     h = int(item.height or 0)
     area = w * h
     if area > 0:
-        score += min(1.0, area / (2000 * 2000)) * 0.15
+        score += min(1.0, area / _AREA_BONUS_FULL) * _AREA_BONUS_WEIGHT
     return score
 
 
+def _drop_small_candidates(items: list[ImageItem]) -> list[ImageItem]:
+    """Skip tiny crops before scoring; keeps the original list if nothing is large enough."""
+    try:
+        min_area = int(os.getenv("IMAGE_MIN_AREA") or DEFAULT_MIN_AREA)
+    except ValueError:
+        min_area = DEFAULT_MIN_AREA
+    if min_area <= 0:
+        return items
+    return [i for i in items if int(i.width or 0) * int(i.height or 0) >= min_area] or items
+
+
 def pick_best_image(items: list[ImageItem], query: str) -> ImageItem:
     if not items:
         raise ValueError("no image candidates")
+    items = _drop_small_candidates(items)
+    q_tokens = _tokens(query)
     best = items[0]
     best_key = (-1.0, 0)
     for item in items:
-        score = _relevance_score(item, query)
+        score = _relevance_score(item, q_tokens)
         area = int(item.width or 0) * int(item.height or 0)
         key = (score, area)
         if key > best_key:
             best = item
             best_key = key
+        if score >= _MAX_RELEVANCE_SCORE:
+            # Every query token hit, alt present, area bonus saturated: only the area
+            # tiebreak is left to win, so keep Pexels' own ranking from here on.
+            break
     return best
 
 
@@ -507,11 +605,14 @@ def pick_top_images(
         raise ValueError("no image candidates")
     count = max(1, int(count))
     exclude_ids = set(exclude_ids or [])
+    large = _drop_small_candidates(items)
+    if len(large) >= count:
+        items = large
     q_tokens = _tokens(query)
 
     ranked: list[tuple[float, int, ImageItem]] = []
     for item in items:
-        score = _relevance_score(item, query, query_tokens=q_tokens)
+        score = _relevance_score(item, q_tokens)
         area = int(item.width or 0) * int(item.height or 0)
         ranked.append((score, area, item))
     ranked.sort(key=lambda r: (r[0], r[1]), reverse=True)
@@ -527,7 +628,8 @@ def pick_top_images(
             ranked = filtered
 
     selected: list[ImageItem] = []
-    selected_tokens: list[set[str]] = []
+    selected_ids: set[str] = set()
+    selected_tokens: list[frozenset[str]] = []
     for _score, _area, item in ranked:
         if item.id in exclude_ids:
             continue
@@ -535,15 +637,17 @@ def pick_top_images(
         if any(_is_similar_tokens(item_tokens, t) for t in selected_tokens):
             continue
         selected.append(item)
+        selected_ids.add(item.id)
         selected_tokens.append(item_tokens)
         if len(selected) >= count:
             break
 
     if len(selected) < count:
         for _score, _area, item in ranked:
-            if item.id in exclude_ids or item in selected:
+            if item.id in exclude_ids or item.id in selected_ids:
                 continue
             selected.append(item)
+            selected_ids.add(item.id)
             if len(selected) >= count:
                 break
 
@@ -551,14 +655,90 @@ def pick_top_images(
 
 
 def _guess_ext(url: str) -> str:
+    # Plain string ops: drop query/fragment, take what follows the last dot. A dot that only
+    # appears in the host (".com/photos/1") yields no known extension and falls back to .jpg.
+    path = (url or "").partition("?")[0].partition("#")[0]
+    return _EXT_MAP.get(path.rpartition(".")[2].lower(), ".jpg")
+
+
+_SEARCH_MEMO_MAX = 64
+_SEARCH_MEMO: OrderedDict[tuple[str, str], tuple[ImageItem, ...]] = OrderedDict()
+_SEARCH_MEMO_LOCK = threading.Lock()
+
+
+def _json_loads(raw: bytes) -> Any:
+    # Both parse bytes directly; no separate decode pass.
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _image_cache_dir() -> Optional[Path]:
+    raw = (os.getenv("IMAGE_CACHE_DIR") or "").strip()
+    return Path(raw).expanduser() / "pexels" if raw else None
+
+
+def _cache_key(url: str) -> str:
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _write_cache_file(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _fetch_search_json(*, url: str, headers: dict[str, str], timeout_s: float) -> bytes:
+    """
+    GET a Pexels search URL, going through the on-disk cache when IMAGE_CACHE_DIR is set.
+
+    Entries younger than IMAGE_CACHE_TTL_S are served as-is; older ones are revalidated with
+    If-None-Match / If-Modified-Since and reused on 304. Cache I/O errors never fail a search.
+    """
+    cache_dir = _image_cache_dir()
+    if cache_dir is None:
+        return http_request(method="GET", url=url, body=None, headers=headers, timeout_s=timeout_s)
+
+    key = _cache_key(url)
+    body_path = cache_dir / f"search_{key}.json"
+    meta_path = cache_dir / f"search_{key}.meta.json"
     try:
-        path = urllib.parse.urlparse(url).path
-        ext = Path(path).suffix.lower()
-        if ext in (".jpg", ".jpeg", ".png", ".webp"):
-            return ext if ext != ".jpeg" else ".jpg"
-    except Exception:
+        ttl_s = float(os.getenv("IMAGE_CACHE_TTL_S") or DEFAULT_CACHE_TTL_S)
+    except ValueError:
+        ttl_s = DEFAULT_CACHE_TTL_S
+    try:
+        cached: Optional[bytes] = body_path.read_bytes()
+        age_s = time.time() - body_path.stat().st_mtime
+        validators = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cached, age_s, validators = None, 0.0, {}
+    if cached is not None and age_s < ttl_s:
+        return cached
+
+    req_headers = dict(headers)
+    if cached is not None and validators.get("etag"):
+        req_headers["If-None-Match"] = validators["etag"]
+    if cached is not None and validators.get("last_modified"):
+        req_headers["If-Modified-Since"] = validators["last_modified"]
+    try:
+        raw, resp_headers = http_fetch(method="GET", url=url, body=None, headers=req_headers, timeout_s=timeout_s)
+    except urllib.error.HTTPError as exc:
+        if exc.code != 304 or cached is None:
+            raise
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+        return cached
+
+    try:
+        _write_cache_file(body_path, raw)
+        meta = {"etag": resp_headers.get("ETag"), "last_modified": resp_headers.get("Last-Modified")}
+        _write_cache_file(meta_path, json.dumps(meta).encode("utf-8"))
+    except OSError:
         pass
-    return ".jpg"
+    return raw
 
 
 def _pexels_search_photos(
@@ -580,21 +760,33 @@ def _pexels_search_photos(
         params["orientation"] = orientation
 
     url = f"{base_url.rstrip('/')}/v1/search?{urllib.parse.urlencode(params)}"
-    req = urllib.request.Request(
-        url,
-        headers={
-            "Authorization": api_key,
-            "User-Agent": "Mozilla/5.0 (redbook_workflow)",
-        },
-        method="GET",
-    )
+    headers = {
+        "Authorization": api_key,
+        "User-Agent": "Mozilla/5.0 (redbook_workflow)",
+    }
+    # In-process memo on top of the disk cache: fallback queries and retries in one run often
+    # repeat a search. Keyed on a digest of the api key, never the key itself.
+    memo_key = (hashlib.sha256(api_key.encode("utf-8")).hexdigest(), url)
+    with _SEARCH_MEMO_LOCK:
+        hit = _SEARCH_MEMO.get(memo_key)
+        if hit is not None:
+            _SEARCH_MEMO.move_to_end(memo_key)
+            return list(hit)
+
     try:
-        with urllib.request.urlopen(req, timeout=timeout_s) as resp:
-            raw = resp.read()
+        raw = _fetch_search_json(url=url, headers=headers, timeout_s=timeout_s)
     except Exception as exc:
         raise RuntimeError(f"Pexels request failed: {exc}") from exc
 
-    data = json.loads(raw.decode("utf-8", errors="replace"))
+    items = _parse_pexels_photos(_json_loads(raw))
+    with _SEARCH_MEMO_LOCK:
+        _SEARCH_MEMO[memo_key] = tuple(items)
+        while len(_SEARCH_MEMO) > _SEARCH_MEMO_MAX:
+            _SEARCH_MEMO.popitem(last=False)
+    return items
+
+
+def _parse_pexels_photos(data: dict[str, Any]) -> list[ImageItem]:
     photos = data.get("photos", [])
     items: list[ImageItem] = []
     for p in photos:
@@ -653,17 +845,58 @@ def _download_image(
     timeout_s: float,
 ) -> None:
     dest_path.parent.mkdir(parents=True, exist_ok=True)
-    req = urllib.request.Request(
-        url,
-        headers={"User-Agent": "Mozilla/5.0 (redbook_workflow)"},
-        method="GET",
-    )
+    cache_dir = _image_cache_dir()
+    cached = cache_dir / f"img_{_cache_key(url)}{dest_path.suffix}" if cache_dir else None
+    if cached is not None and cached.is_file():
+        try:
+            os.link(cached, dest_path)
+        except OSError:
+            shutil.copyfile(cached, dest_path)
+        return
+
+    # Stream into a sibling .part file and rename, so a dropped connection never leaves a
+    # truncated image that the `dest_path.exists()` check would later treat as downloaded.
+    headers = {"User-Agent": "Mozilla/5.0 (redbook_workflow)"}
+    part = dest_path.with_name(dest_path.name + ".part")
     try:
-        with urllib.request.urlopen(req, timeout=timeout_s) as resp:
-            data = resp.read()
+        with part.open("wb") as f:
+            http_request(method="GET", url=url, body=None, headers=headers, timeout_s=timeout_s, sink=f)
+        os.replace(part, dest_path)
     except Exception as exc:
+        part.unlink(missing_ok=True)
         raise RuntimeError(f"image download failed: {exc}") from exc
-    dest_path.write_bytes(data)
+
+    if cached is not None:
+        try:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+            shutil.copyfile(dest_path, tmp)
+            os.replace(tmp, cached)
+        except OSError:
+            pass
+
+
+def _download_picks(jobs: list[tuple[str, Path]], *, timeout_s: float) -> list[Optional[str]]:
+    """
+    Download (url, dest_path) pairs, concurrently when there are several.
+
+    Returns one entry per job, in order: None on success (or when dest already exists),
+    else the error message.
+    """
+
+    def _one(job: tuple[str, Path]) -> Optional[str]:
+        url, dest_path = job
+        try:
+            if not dest_path.exists():
+                _download_image(url=url, dest_path=dest_path, timeout_s=timeout_s)
+        except Exception as exc:
+            return str(exc)
+        return None
+
+    if len(jobs) <= 1:
+        return [_one(job) for job in jobs]
+    with ThreadPoolExecutor(max_workers=min(len(jobs), DEFAULT_DOWNLOAD_WORKERS)) as pool:
+        return list(pool.map(_one, jobs))
 
 
 def fetch_and_download_related_images(
@@ -686,13 +919,13 @@ def fetch_and_download_related_images(
       - downloaded file paths
       - meta dict list for persistence/audit (provider/query/picked/attribution)
     """
-    provider_env = (provider or os.getenv("IMAGE_PROVIDER") or "").strip().lower()
-    provider_name = provider_env or DEFAULT_PROVIDER
+    settings = _image_settings()
+    provider_name = (provider or "").strip().lower() or settings.provider or DEFAULT_PROVIDER
 
-    timeout_s = float(os.getenv("IMAGE_TIMEOUT_S") or (timeout_s or DEFAULT_TIMEOUT_S))
-    max_candidates = int(os.getenv("IMAGE_MAX_CANDIDATES") or (max_candidates or DEFAULT_MAX_CANDIDATES))
-    orientation = (os.getenv("IMAGE_ORIENTATION") or DEFAULT_ORIENTATION).strip().lower()
-    default_query = (os.getenv("IMAGE_QUERY_DEFAULT") or DEFAULT_QUERY).strip() or DEFAULT_QUERY
+    timeout_s = settings.timeout_s or float(timeout_s or DEFAULT_TIMEOUT_S)
+    max_candidates = settings.max_candidates or int(max_candidates or DEFAULT_MAX_CANDIDATES)
+    orientation = settings.orientation
+    default_query = settings.default_query
     requested_count = count
     count = _resolve_image_count(count)
 
@@ -745,6 +978,8 @@ def fetch_and_download_related_images(
                         dest_dir=dest_dir,
                         timeout_s=aliyun_timeout_s,
                         download_timeout_s=aliyun_download_timeout_s,
+                        # Same prompt every iteration: only a single image may come from the cache.
+                        use_cache=count == 1,
                     )
                     break
                 except Exception as exc:
@@ -784,68 +1019,91 @@ def fetch_and_download_related_images(
     paths: list[Path] = []
     metas: list[dict[str, Any]] = []
 
-    for q in queries:
+    # Resolve credentials once for all queries; a missing key fails every query the same way.
+    pexels_config: Optional[tuple[str, str]] = None
+    if provider_name == "pexels":
         try:
-            if provider_name == "pexels":
-                api_key, base_url = _load_pexels_config()
-                candidates = _pexels_search_photos(
-                    api_key=api_key,
-                    base_url=base_url,
-                    query=q,
-                    per_page=max_candidates,
-                    orientation=orientation,
-                    timeout_s=timeout_s,
-                )
-            else:
-                raise RuntimeError(
-                    f"unsupported IMAGE_PROVIDER={provider_name!r}; supported: pexels, aliyun"
-                )
+            pexels_config = _load_pexels_config()
         except Exception as exc:
             last_err = str(exc)
-            continue
+            queries = []
 
-        if not candidates:
-            continue
-
-        picks = pick_top_images(
-            candidates, q, count - len(paths), exclude_ids=used_ids
+    def _search_one(q: str) -> list[ImageItem]:
+        if pexels_config is None:
+            raise RuntimeError(
+                f"unsupported IMAGE_PROVIDER={provider_name!r}; supported: pexels, aliyun"
+            )
+        api_key, base_url = pexels_config
+        return _pexels_search_photos(
+            api_key=api_key,
+            base_url=base_url,
+            query=q,
+            per_page=max_candidates,
+            orientation=orientation,
+            timeout_s=timeout_s,
         )
-        if not picks:
-            continue
 
-        for picked in picks:
-            if len(paths) >= count:
-                break
-            if picked.id in used_ids:
-                continue
-            ext = _guess_ext(picked.download_url)
-            filename = f"auto_image_{provider_name}_{picked.id}{ext}"
-            dest_path = dest_dir / filename
+    # Opt-in: search the fallback queries up front so a miss on the first one doesn't cost
+    # another full round-trip. Results are still consumed in query order.
+    parallel = (os.getenv("IMAGE_PARALLEL_QUERIES") or "").strip().lower() in ("1", "true", "yes", "on")
+    executor = ThreadPoolExecutor(max_workers=len(queries)) if parallel and len(queries) > 1 else None
+    futures = {q: executor.submit(_search_one, q) for q in queries} if executor else {}
+    try:
+        for q in queries:
             try:
-                if not dest_path.exists():
-                    _download_image(
-                        url=picked.download_url, dest_path=dest_path, timeout_s=timeout_s
-                    )
+                candidates = futures[q].result() if executor else _search_one(q)
             except Exception as exc:
                 last_err = str(exc)
                 continue
 
-            meta: dict[str, Any] = {
-                "mode": "auto_image",
-                "provider": provider_name,
-                "query": q,
-                "query_original": query_original,
-                "query_used": q,
-                "picked": asdict(picked),
-                "downloaded_path": str(dest_path),
-                "downloaded_at": datetime.now(timezone.utc).isoformat(),
-            }
-            paths.append(dest_path)
-            metas.append(meta)
-            used_ids.add(picked.id)
+            if not candidates:
+                continue
 
-        if len(paths) >= count:
-            break
+            picks = pick_top_images(
+                candidates, q, count - len(paths), exclude_ids=used_ids
+            )
+            if not picks:
+                continue
+
+            todo: list[tuple[ImageItem, Path]] = []
+            todo_ids: set[str] = set()
+            for picked in picks:
+                if len(paths) + len(todo) >= count:
+                    break
+                pid = picked.id
+                if pid in used_ids or pid in todo_ids:
+                    continue
+                ext = _guess_ext(picked.download_url)
+                todo.append((picked, dest_dir / f"auto_image_{provider_name}_{pid}{ext}"))
+                todo_ids.add(pid)
+
+            errors = _download_picks(
+                [(picked.download_url, dest_path) for picked, dest_path in todo], timeout_s=timeout_s
+            )
+            for (picked, dest_path), err in zip(todo, errors):
+                if err is not None:
+                    last_err = err
+                    continue
+
+                meta: dict[str, Any] = {
+                    "mode": "auto_image",
+                    "provider": provider_name,
+                    "query": q,
+                    "query_original": query_original,
+                    "query_used": q,
+                    "picked": asdict(picked),
+                    "downloaded_path": str(dest_path),
+                    "downloaded_at": datetime.now(timezone.utc).isoformat(),
+                }
+                paths.append(dest_path)
+                metas.append(meta)
+                used_ids.add(picked.id)
+
+            if len(paths) >= count:
+                break
+    finally:
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     if not paths:
         raise RuntimeError(
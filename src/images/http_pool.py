@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import http.client
+import io
+import shutil
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from email.message import Message
+from typing import BinaryIO, Optional
+
+_CHUNK_SIZE = 64 * 1024
+_MAX_REDIRECTS = 5
+_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+# Per-thread keep-alive connections, keyed by (scheme, netloc).
+_CONN_LOCAL = threading.local()
+
+
+def drop_connection(key: tuple[str, str]) -> None:
+    conn = getattr(_CONN_LOCAL, "pool", {}).pop(key, None)
+    if conn is not None:
+        conn.close()
+
+
+def http_request(
+    *,
+    method: str,
+    url: str,
+    body: Optional[bytes],
+    headers: dict[str, str],
+    timeout_s: float,
+    sink: Optional[BinaryIO] = None,
+) -> bytes:
+    return http_fetch(method=method, url=url, body=body, headers=headers, timeout_s=timeout_s, sink=sink)[0]
+
+
+def http_fetch(
+    *,
+    method: str,
+    url: str,
+    body: Optional[bytes],
+    headers: dict[str, str],
+    timeout_s: float,
+    sink: Optional[BinaryIO] = None,
+) -> tuple[bytes, Message]:
+    """
+    Send one request over a per-thread keep-alive connection and return (body, headers).
+
+    Repeated calls against the same host (task polling, Pexels search + CDN download) reuse
+    the connection instead of paying a TCP+TLS handshake each time. With `sink`, a successful
+    body is streamed into it in 64 KiB chunks and b"" is returned. HTTP errors are raised as
+    urllib.error.HTTPError (body readable via `.read()`), same as urlopen. Proxied URLs go
+    through urlopen unchanged. `http_request` is the same call returning only the body.
+    """
+    for _ in range(_MAX_REDIRECTS + 1):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https") or urllib.request.getproxies().get(parts.scheme):
+            req = urllib.request.Request(url, data=body, headers=headers, method=method)
+            with urllib.request.urlopen(req, timeout=timeout_s) as resp:
+                if sink is None:
+                    return resp.read(), resp.headers
+                shutil.copyfileobj(resp, sink, _CHUNK_SIZE)
+                return b"", resp.headers
+
+        status, location, raw, resp_headers = _send(
+            parts, method=method, url=url, body=body, headers=headers, timeout_s=timeout_s, sink=sink
+        )
+        if location is None:
+            return raw, resp_headers
+        url = urllib.parse.urljoin(url, location)
+        if status == 303:
+            method, body = "GET", None
+    raise RuntimeError(f"too many redirects: {url}")
+
+
+def _send(
+    parts: urllib.parse.SplitResult,
+    *,
+    method: str,
+    url: str,
+    body: Optional[bytes],
+    headers: dict[str, str],
+    timeout_s: float,
+    sink: Optional[BinaryIO],
+) -> tuple[int, Optional[str], bytes, Message]:
+    key = (parts.scheme, parts.netloc)
+    target = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+    pool = getattr(_CONN_LOCAL, "pool", None)
+    if pool is None:
+        pool = _CONN_LOCAL.pool = {}
+    if method != "GET":
+        # Non-idempotent: never risk replaying it on a connection the server may have closed.
+        drop_connection(key)
+
+    for _ in range(2):
+        conn = pool.get(key)
+        reused = conn is not None
+        if conn is None:
+            conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            conn = pool[key] = conn_cls(parts.netloc, timeout=timeout_s)
+        elif conn.sock is not None:
+            conn.sock.settimeout(timeout_s)
+        conn.timeout = timeout_s
+        try:
+            conn.request(method, target, body=body, headers=headers)
+            resp = conn.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            drop_connection(key)
+            if reused:
+                continue  # stale keep-alive connection; retry once on a fresh one
+            raise
+        except Exception:
+            drop_connection(key)
+            raise
+        location = resp.getheader("Location") if resp.status in _REDIRECT_STATUSES else None
+        try:
+            if sink is None or resp.status >= 300:
+                raw = resp.read()
+            else:
+                shutil.copyfileobj(resp, sink, _CHUNK_SIZE)
+                raw = b""
+        except Exception:
+            drop_connection(key)
+            raise
+        if resp.will_close:
+            drop_connection(key)
+        if resp.status >= 400 or (resp.status >= 300 and not location):
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.msg, io.BytesIO(raw))
+        return resp.status, location, raw, resp.msg
+    raise RuntimeError("unreachable")
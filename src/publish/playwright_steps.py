@@ -5,8 +5,9 @@ import os
 import re
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
 
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 from playwright.sync_api import sync_playwright
@@ -1020,6 +1021,356 @@ def _wait_for_upload_settle(
     return False
 
 
+def _launch_context(p, profile_dir: Path, channel: Optional[str], args: list[str]):
+    """
+    Open the browser context used to drive the creator UI.
+
+    Returns (context, should_close_context, detail). In CDP mode the context belongs to the
+    user-launched Chrome and must not be closed by us.
+    """
+    cdp_url = _resolve_cdp_url()
+    if cdp_url:
+        # Attach to an existing Chrome instance (recommended when the profile is already open).
+        browser = p.chromium.connect_over_cdp(cdp_url)
+        context = browser.contexts[0] if browser.contexts else browser.new_context()
+        detail = f"cdp={cdp_url}"
+        should_close_context = False
+    else:
+        launch_kwargs = {"headless": False}
+        if channel:
+            launch_kwargs["channel"] = channel
+        if args:
+            launch_kwargs["args"] = args
+        context = p.chromium.launch_persistent_context(str(profile_dir), **launch_kwargs)
+        detail = str(profile_dir)
+        should_close_context = True
+    context.set_default_timeout(30000)
+    return context, should_close_context, detail
+
+
+def _acquire_page(context, should_close_context: bool, *, fresh: bool = False):
+    """
+    Pick the page that drives one post. Returns (page, opened).
+
+    A persistent profile reuses its launch tab so it is not left blank next to ours; in CDP mode
+    a new tab is always opened to avoid hijacking an existing one (e.g. ChatGPT page). `fresh`
+    forces a new tab. `opened` tells the caller the page is its own to close.
+    """
+    if should_close_context and context.pages and not fresh:
+        return context.pages[0], False
+    return context.new_page(), True
+
+
+def _save_draft_on_page(
+    page,
+    post: Post,
+    *,
+    exec_rec: Execution,
+    steps: List[StepResult],
+    assets: list[str],
+    dry_run: bool,
+    login_hold: int,
+    login_only: bool,
+    wait_timeout_ms: int,
+    verify_by_title: bool = False,
+) -> Execution:
+    """
+    Drive one post through upload/fill/save on `page`.
+
+    The save is confirmed by the success toast, a rise in the draft counter, or the post's
+    title showing up in the draft box. With `verify_by_title` the counter is skipped: parallel
+    CDP workers share one account, so another worker's save can move it.
+    """
+
+    def _step(name: str, status: str, detail: str = ""):
+        steps.append(StepResult(name=name, status=status, detail=detail))
+
+    _step("open_page", "in_progress", TARGET_URL)
+    page.goto(TARGET_URL, wait_until="domcontentloaded")
+    steps[-1].status = "success"
+
+    if login_hold > 0:
+        _step("login_hold", "in_progress", f"wait {login_hold}s for login")
+        time.sleep(login_hold)
+        steps[-1].status = "success"
+
+    ev_dir = evidence_dir(post.id, exec_rec.id)
+    ev_dir.mkdir(parents=True, exist_ok=True)
+
+    _step("page_state", "in_progress", "")
+    steps[-1].detail = json.dumps(
+        {"url": page.url, "title": page.title()},
+        ensure_ascii=False,
+    )
+    steps[-1].status = "success"
+
+    _step("screenshot_before_wait", "in_progress", "")
+    shot_path = ev_dir / "before_wait.png"
+    page.screenshot(path=str(shot_path), full_page=True)
+    steps[-1].detail = f"saved to {shot_path}"
+    steps[-1].status = "success"
+
+    _step("html_before_wait", "in_progress", "")
+    html_path = ev_dir / "before_wait.html"
+    html_path.write_text(page.content(), encoding="utf-8")
+    steps[-1].detail = f"saved to {html_path}"
+    steps[-1].status = "success"
+
+    _step("frame_info", "in_progress", "")
+    frame_urls = [f.url for f in page.frames]
+    steps[-1].detail = json.dumps(frame_urls, ensure_ascii=False)
+    steps[-1].status = "success"
+
+    _step("wait_for_publish_ui", "in_progress", "")
+    matched = _wait_for_any_text(page, WAIT_TEXTS, wait_timeout_ms)
+    steps[-1].detail = f"matched {matched}"
+    steps[-1].status = "success"
+
+    _step("wait_for_editor", "in_progress", "")
+    editor_sel = _wait_for_any_locator(
+        page,
+        [
+            "input[type='file']",
+            "input[placeholder*='\u6807\u9898']",
+            "textarea",
+            "[contenteditable='true']",
+        ],
+        120000,
+    )
+    steps[-1].detail = f"matched {editor_sel}"
+    steps[-1].status = "success"
+
+    if login_only:
+        exec_rec.result = "login_ready"
+        return exec_rec
+
+    if dry_run:
+        _step("upload_images", "skipped", "dry_run")
+        _step("fill_title_body", "skipped", "dry_run")
+        _step("save_draft", "skipped", "dry_run")
+        exec_rec.result = "pending"
+        return exec_rec
+
+    if assets:
+        _step("upload_images", "in_progress", f"{len(assets)} files")
+        uploaded, method = _try_upload_with_button(page, assets)
+        if not uploaded:
+            uploaded, method = _try_upload_with_input(page, assets)
+        steps[-1].detail = f"{len(assets)} files via {method}"
+        if not uploaded:
+            raise RuntimeError("file input not found")
+        try:
+            page.wait_for_load_state("networkidle", timeout=60000)
+        except Exception:
+            pass
+        steps[-1].status = "success"
+        _step("wait_for_upload_complete", "in_progress", "")
+        confirmed = _wait_for_upload_ready(page, len(assets))
+        steps[-1].detail = f"confirmed={confirmed}"
+        if not confirmed:
+            raise RuntimeError("upload count not ready")
+        steps[-1].status = "success"
+        _step("wait_for_processing_done", "in_progress", "")
+        processed = _wait_for_processing_done(page)
+        steps[-1].detail = f"processed={processed}"
+        if not processed:
+            raise RuntimeError("upload processing not finished")
+        steps[-1].status = "success"
+        settle_s = int(os.getenv("XHS_UPLOAD_SETTLE_S") or 5)
+        settle_timeout_s = float(os.getenv("XHS_UPLOAD_SETTLE_TIMEOUT_S") or 180.0)
+        _step(
+            "wait_for_upload_settle",
+            "in_progress",
+            f"{settle_s}s timeout={int(settle_timeout_s)}s",
+        )
+        settled = _wait_for_upload_settle(
+            page,
+            settle_s=settle_s,
+            timeout_ms=int(max(1.0, settle_timeout_s) * 1000),
+        )
+        steps[-1].detail = f"settled={settled}"
+        if not settled:
+            raise RuntimeError("upload not settled")
+        steps[-1].status = "success"
+        _step("select_cover", "in_progress", "")
+        cover_applied, cover_detail = _maybe_select_cover(page)
+        steps[-1].detail = cover_detail
+        steps[-1].status = "success"
+    else:
+        _step("upload_images", "skipped", "no assets")
+
+    _step("snapshot_after_upload", "in_progress", "")
+    after_shot = ev_dir / "after_upload.png"
+    page.screenshot(path=str(after_shot), full_page=True)
+    steps[-1].detail = f"saved to {after_shot}"
+    steps[-1].status = "success"
+
+    _step("wait_for_editor_after_upload", "in_progress", "")
+    editor_sel = _wait_for_any_locator(
+        page,
+        [
+            "input[placeholder*='\u6807\u9898']",
+            "textarea",
+            "[contenteditable='true']",
+        ],
+        60000,
+    )
+    steps[-1].detail = f"matched {editor_sel}"
+    steps[-1].status = "success"
+
+    _step("fill_title_body", "in_progress", "")
+    title_ok, body_ok = _fill_text_fields(page, post.title, post.body)
+    steps[-1].detail = f"title={title_ok} body={body_ok}"
+    steps[-1].status = "success"
+
+    _step("verify_title_body", "in_progress", "")
+    v_title, v_body = _verify_title_body(page, post.title, post.body)
+    steps[-1].detail = f"title={v_title} body={v_body}"
+    if not (v_title and v_body):
+        raise RuntimeError("title/body not filled")
+    steps[-1].status = "success"
+
+    _step("save_draft", "in_progress", "")
+    clicked, detail = _click_draft(page)
+    steps[-1].detail = detail
+    if not clicked:
+        raise RuntimeError(detail)
+    steps[-1].status = "success"
+
+    _step("confirm_leave", "in_progress", "")
+    leave_clicked = False
+    for text in ("\u6682\u5b58\u79bb\u5f00", "\u786e\u5b9a", "\u7ee7\u7eed\u79bb\u5f00"):
+        if _click_first(page.get_by_role("button", name=text), timeout_ms=2000):
+            leave_clicked = True
+            break
+        if _click_first(page.locator(f"button:has-text('{text}')"), timeout_ms=2000):
+            leave_clicked = True
+            break
+    steps[-1].detail = f"clicked={leave_clicked}"
+    steps[-1].status = "success"
+    before_count = None if verify_by_title else _extract_draft_count(page)
+
+    _step("snapshot_after_save", "in_progress", "")
+    after_save = ev_dir / "after_save.png"
+    page.screenshot(path=str(after_save), full_page=True)
+    steps[-1].detail = f"saved to {after_save}"
+    steps[-1].status = "success"
+
+    _step("verify_draft_saved", "in_progress", "")
+    ok = False
+    toast = ""
+    try:
+        toast = _wait_for_any_text(page, SAVE_OK_TEXTS, 20000)
+        ok = True
+    except PlaywrightTimeoutError:
+        pass
+    after_count = before_count
+    for _ in range(0 if verify_by_title else 30):
+        after_count = _extract_draft_count(page)
+        if (
+            before_count is not None
+            and after_count is not None
+            and after_count > before_count
+        ):
+            ok = True
+            break
+        time.sleep(1)
+    fallback_opened = False
+    fallback_exists = False
+    if not ok:
+        try:
+            fallback_opened = _open_draft_box(page)
+            if fallback_opened:
+                _open_image_draft_tab(page)
+                page.locator(DRAFT_ITEM_SELECTOR).first.wait_for(timeout=30000)
+                fallback_exists = _draft_item_exists(page, post.title)
+                ok = fallback_exists
+        except Exception:
+            fallback_exists = False
+    steps[-1].detail = (
+        f"toast={toast or 'none'} before={before_count} after={after_count} "
+        f"fallback_opened={fallback_opened} fallback_exists={fallback_exists}"
+    )
+    if not ok:
+        raise RuntimeError("draft save verification failed")
+    steps[-1].status = "success"
+
+    # From here on, draft-box navigation is best-effort. If the UI changes,
+    # keep the saved result but leave evidence for manual verification.
+    exec_rec.result = "saved_draft"
+
+    try:
+        _step("open_draft_box", "in_progress", "")
+        opened = _open_draft_box(page)
+        steps[-1].detail = f"opened={opened}"
+        if not opened:
+            steps[-1].status = "skipped"
+            return exec_rec
+        steps[-1].status = "success"
+
+        _step("open_draft_tab", "in_progress", "")
+        opened_tab = _open_image_draft_tab(page)
+        steps[-1].detail = f"opened={opened_tab}"
+        if not opened_tab:
+            steps[-1].status = "skipped"
+            return exec_rec
+        steps[-1].status = "success"
+
+        _step("wait_for_draft_items", "in_progress", "")
+        try:
+            page.locator(DRAFT_ITEM_SELECTOR).first.wait_for(timeout=30000)
+            steps[-1].detail = "ready"
+            steps[-1].status = "success"
+        except PlaywrightTimeoutError:
+            steps[-1].detail = "timeout"
+            steps[-1].status = "skipped"
+            return exec_rec
+
+        _step("wait_for_draft_cover", "in_progress", "")
+        cover_ready = False
+        try:
+            cover_ready = _wait_for_draft_cover(page, post.title)
+            steps[-1].detail = f"ready={cover_ready}"
+            steps[-1].status = "success"
+        except Exception as exc:
+            steps[-1].detail = f"error: {exc}"
+            steps[-1].status = "skipped"
+
+        _step("snapshot_draft_box", "in_progress", "")
+        try:
+            draft_shot = ev_dir / "draft_box.png"
+            page.screenshot(path=str(draft_shot), full_page=True)
+            steps[-1].detail = f"saved to {draft_shot}"
+            steps[-1].status = "success"
+        except Exception as exc:
+            steps[-1].detail = f"error: {exc}"
+            steps[-1].status = "skipped"
+
+        _step("html_draft_box", "in_progress", "")
+        try:
+            draft_html = ev_dir / "draft_box.html"
+            draft_html.write_text(page.content(), encoding="utf-8")
+            steps[-1].detail = f"saved to {draft_html}"
+            steps[-1].status = "success"
+        except Exception as exc:
+            steps[-1].detail = f"error: {exc}"
+            steps[-1].status = "skipped"
+
+        _step("verify_draft_box_item", "in_progress", "")
+        try:
+            verified = _verify_draft_item(page, post.title)
+            steps[-1].detail = f"verified={verified} cover_ready={cover_ready}"
+            steps[-1].status = "success" if (verified and cover_ready) else "skipped"
+        except Exception as exc:
+            steps[-1].detail = f"error: {exc}"
+            steps[-1].status = "skipped"
+    except Exception as exc:
+        # Do not fail the whole run after the draft has already been saved.
+        _step("draft_box_optional", "skipped", f"error: {exc}")
+        return exec_rec
+    return exec_rec
+
+
 def run_save_draft_sync(
     post: Post,
     *,
@@ -1033,10 +1384,7 @@ def run_save_draft_sync(
     exec_rec = execution or Execution(post_id=post.id, result="pending")
     steps: List[StepResult] = []
 
-    def _step(name: str, status: str, detail: str = ""):
-        steps.append(StepResult(name=name, status=status, detail=detail))
-
-    assets = [str(Path(p)) for p in (assets or []) if Path(p).is_file()]
+    assets = [os.path.normpath(p) for p in (assets or []) if os.path.isfile(p)]
     context = None
     should_close_context = True
 
@@ -1044,322 +1392,172 @@ def run_save_draft_sync(
         profile_dir, channel, args = _resolve_profile_config()
         profile_dir.mkdir(parents=True, exist_ok=True)
 
-        _step("launch", "in_progress", str(profile_dir))
+        steps.append(StepResult(name="launch", status="in_progress", detail=str(profile_dir)))
         with sync_playwright() as p:
-            cdp_url = _resolve_cdp_url()
-            if cdp_url:
-                # Attach to an existing Chrome instance (recommended when the profile is already open).
-                context = None
-                browser = p.chromium.connect_over_cdp(cdp_url)
-                context = browser.contexts[0] if browser.contexts else browser.new_context()
-                should_close_context = False
-                steps[-1].detail = f"cdp={cdp_url}"
-            else:
-                launch_kwargs = {"headless": False}
-                if channel:
-                    launch_kwargs["channel"] = channel
-                if args:
-                    launch_kwargs["args"] = args
-                context = p.chromium.launch_persistent_context(str(profile_dir), **launch_kwargs)
-            context.set_default_timeout(30000)
+            context, should_close_context, launch_detail = _launch_context(
+                p, profile_dir, channel, args
+            )
+            steps[-1].detail = launch_detail
             steps[-1].status = "success"
             try:
-                # In CDP mode, avoid hijacking an existing tab (e.g. ChatGPT page); open a new one.
-                page = context.new_page() if not should_close_context else (context.pages[0] if context.pages else context.new_page())
-                _step("open_page", "in_progress", TARGET_URL)
-                page.goto(TARGET_URL, wait_until="domcontentloaded")
-                steps[-1].status = "success"
-
-                if login_hold > 0:
-                    _step("login_hold", "in_progress", f"wait {login_hold}s for login")
-                    time.sleep(login_hold)
-                    steps[-1].status = "success"
-
-                ev_dir = evidence_dir(post.id, exec_rec.id)
-                ev_dir.mkdir(parents=True, exist_ok=True)
-
-                _step("page_state", "in_progress", "")
-                steps[-1].detail = json.dumps(
-                    {"url": page.url, "title": page.title()},
-                    ensure_ascii=False,
-                )
-                steps[-1].status = "success"
-
-                _step("screenshot_before_wait", "in_progress", "")
-                shot_path = ev_dir / "before_wait.png"
-                page.screenshot(path=str(shot_path), full_page=True)
-                steps[-1].detail = f"saved to {shot_path}"
-                steps[-1].status = "success"
-
-                _step("html_before_wait", "in_progress", "")
-                html_path = ev_dir / "before_wait.html"
-                html_path.write_text(page.content(), encoding="utf-8")
-                steps[-1].detail = f"saved to {html_path}"
-                steps[-1].status = "success"
-
-                _step("frame_info", "in_progress", "")
-                frame_urls = [f.url for f in page.frames]
-                steps[-1].detail = json.dumps(frame_urls, ensure_ascii=False)
-                steps[-1].status = "success"
-
-                _step("wait_for_publish_ui", "in_progress", "")
-                matched = _wait_for_any_text(page, WAIT_TEXTS, wait_timeout_ms)
-                steps[-1].detail = f"matched {matched}"
-                steps[-1].status = "success"
-
-                _step("wait_for_editor", "in_progress", "")
-                editor_sel = _wait_for_any_locator(
+                page, _opened = _acquire_page(context, should_close_context)
+                _save_draft_on_page(
                     page,
-                    [
-                        "input[type='file']",
-                        "input[placeholder*='\u6807\u9898']",
-                        "textarea",
-                        "[contenteditable='true']",
-                    ],
-                    120000,
+                    post,
+                    exec_rec=exec_rec,
+                    steps=steps,
+                    assets=assets,
+                    dry_run=dry_run,
+                    login_hold=login_hold,
+                    login_only=login_only,
+                    wait_timeout_ms=wait_timeout_ms,
                 )
-                steps[-1].detail = f"matched {editor_sel}"
-                steps[-1].status = "success"
-
-                if login_only:
-                    exec_rec.result = "login_ready"
-                    return exec_rec
-
-                if dry_run:
-                    _step("upload_images", "skipped", "dry_run")
-                    _step("fill_title_body", "skipped", "dry_run")
-                    _step("save_draft", "skipped", "dry_run")
-                    exec_rec.result = "pending"
-                    return exec_rec
-
-                if assets:
-                    _step("upload_images", "in_progress", f"{len(assets)} files")
-                    uploaded, method = _try_upload_with_button(page, assets)
-                    if not uploaded:
-                        uploaded, method = _try_upload_with_input(page, assets)
-                    steps[-1].detail = f"{len(assets)} files via {method}"
-                    if not uploaded:
-                        raise RuntimeError("file input not found")
-                    try:
-                        page.wait_for_load_state("networkidle", timeout=60000)
-                    except Exception:
-                        pass
-                    steps[-1].status = "success"
-                    _step("wait_for_upload_complete", "in_progress", "")
-                    confirmed = _wait_for_upload_ready(page, len(assets))
-                    steps[-1].detail = f"confirmed={confirmed}"
-                    if not confirmed:
-                        raise RuntimeError("upload count not ready")
-                    steps[-1].status = "success"
-                    _step("wait_for_processing_done", "in_progress", "")
-                    processed = _wait_for_processing_done(page)
-                    steps[-1].detail = f"processed={processed}"
-                    if not processed:
-                        raise RuntimeError("upload processing not finished")
-                    steps[-1].status = "success"
-                    settle_s = int(os.getenv("XHS_UPLOAD_SETTLE_S") or 5)
-                    settle_timeout_s = float(os.getenv("XHS_UPLOAD_SETTLE_TIMEOUT_S") or 180.0)
-                    _step(
-                        "wait_for_upload_settle",
-                        "in_progress",
-                        f"{settle_s}s timeout={int(settle_timeout_s)}s",
-                    )
-                    settled = _wait_for_upload_settle(
-                        page,
-                        settle_s=settle_s,
-                        timeout_ms=int(max(1.0, settle_timeout_s) * 1000),
-                    )
-                    steps[-1].detail = f"settled={settled}"
-                    if not settled:
-                        raise RuntimeError("upload not settled")
-                    steps[-1].status = "success"
-                    _step("select_cover", "in_progress", "")
-                    cover_applied, cover_detail = _maybe_select_cover(page)
-                    steps[-1].detail = cover_detail
-                    steps[-1].status = "success"
-                else:
-                    _step("upload_images", "skipped", "no assets")
+            finally:
+                if should_close_context:
+                    context.close()
+    except Exception as exc:  # pragma: no cover
+        exec_rec.result = "failed"
+        exec_rec.error = {"message": str(exc)}
+    finally:
+        exec_rec.steps = steps
+        save_execution(exec_rec)
 
-                _step("snapshot_after_upload", "in_progress", "")
-                after_shot = ev_dir / "after_upload.png"
-                page.screenshot(path=str(after_shot), full_page=True)
-                steps[-1].detail = f"saved to {after_shot}"
-                steps[-1].status = "success"
+    return exec_rec
 
-                _step("wait_for_editor_after_upload", "in_progress", "")
-                editor_sel = _wait_for_any_locator(
-                    page,
-                    [
-                        "input[placeholder*='\u6807\u9898']",
-                        "textarea",
-                        "[contenteditable='true']",
-                    ],
-                    60000,
-                )
-                steps[-1].detail = f"matched {editor_sel}"
-                steps[-1].status = "success"
-
-                _step("fill_title_body", "in_progress", "")
-                title_ok, body_ok = _fill_text_fields(page, post.title, post.body)
-                steps[-1].detail = f"title={title_ok} body={body_ok}"
-                steps[-1].status = "success"
-
-                _step("verify_title_body", "in_progress", "")
-                v_title, v_body = _verify_title_body(page, post.title, post.body)
-                steps[-1].detail = f"title={v_title} body={v_body}"
-                if not (v_title and v_body):
-                    raise RuntimeError("title/body not filled")
-                steps[-1].status = "success"
-
-                _step("save_draft", "in_progress", "")
-                clicked, detail = _click_draft(page)
-                steps[-1].detail = detail
-                if not clicked:
-                    raise RuntimeError(detail)
-                steps[-1].status = "success"
-
-                _step("confirm_leave", "in_progress", "")
-                leave_clicked = False
-                for text in ("\u6682\u5b58\u79bb\u5f00", "\u786e\u5b9a", "\u7ee7\u7eed\u79bb\u5f00"):
-                    if _click_first(page.get_by_role("button", name=text), timeout_ms=2000):
-                        leave_clicked = True
-                        break
-                    if _click_first(page.locator(f"button:has-text('{text}')"), timeout_ms=2000):
-                        leave_clicked = True
-                        break
-                steps[-1].detail = f"clicked={leave_clicked}"
-                steps[-1].status = "success"
-                before_count = _extract_draft_count(page)
-
-                _step("snapshot_after_save", "in_progress", "")
-                after_save = ev_dir / "after_save.png"
-                page.screenshot(path=str(after_save), full_page=True)
-                steps[-1].detail = f"saved to {after_save}"
-                steps[-1].status = "success"
-
-                _step("verify_draft_saved", "in_progress", "")
-                ok = False
-                toast = ""
-                try:
-                    toast = _wait_for_any_text(page, SAVE_OK_TEXTS, 20000)
-                    ok = True
-                except PlaywrightTimeoutError:
-                    pass
-                after_count = before_count
-                for _ in range(30):
-                    after_count = _extract_draft_count(page)
-                    if (
-                        before_count is not None
-                        and after_count is not None
-                        and after_count > before_count
-                    ):
-                        ok = True
-                        break
-                    time.sleep(1)
-                fallback_opened = False
-                fallback_exists = False
-                if not ok:
-                    try:
-                        fallback_opened = _open_draft_box(page)
-                        if fallback_opened:
-                            _open_image_draft_tab(page)
-                            page.locator(DRAFT_ITEM_SELECTOR).first.wait_for(timeout=30000)
-                            fallback_exists = _draft_item_exists(page, post.title)
-                            ok = fallback_exists
-                    except Exception:
-                        fallback_exists = False
-                steps[-1].detail = (
-                    f"toast={toast or 'none'} before={before_count} after={after_count} "
-                    f"fallback_opened={fallback_opened} fallback_exists={fallback_exists}"
-                )
-                if not ok:
-                    raise RuntimeError("draft save verification failed")
-                steps[-1].status = "success"
 
-                # From here on, draft-box navigation is best-effort. If the UI changes,
-                # keep the saved result but leave evidence for manual verification.
-                exec_rec.result = "saved_draft"
+def run_save_draft_batch_sync(
+    jobs: Iterable[tuple[Post, Optional[list[str]], Optional[Execution]]],
+    *,
+    dry_run: bool = False,
+    login_hold: int = 0,
+    wait_timeout_ms: int = WAIT_TIMEOUT_MS,
+    verify_by_title: bool = False,
+) -> Iterator[Execution]:
+    """
+    Save drafts for several posts within ONE Playwright session.
 
-                try:
-                    _step("open_draft_box", "in_progress", "")
-                    opened = _open_draft_box(page)
-                    steps[-1].detail = f"opened={opened}"
-                    if not opened:
-                        steps[-1].status = "skipped"
-                        return exec_rec
-                    steps[-1].status = "success"
-
-                    _step("open_draft_tab", "in_progress", "")
-                    opened_tab = _open_image_draft_tab(page)
-                    steps[-1].detail = f"opened={opened_tab}"
-                    if not opened_tab:
-                        steps[-1].status = "skipped"
-                        return exec_rec
-                    steps[-1].status = "success"
-
-                    _step("wait_for_draft_items", "in_progress", "")
-                    try:
-                        page.locator(DRAFT_ITEM_SELECTOR).first.wait_for(timeout=30000)
-                        steps[-1].detail = "ready"
-                        steps[-1].status = "success"
-                    except PlaywrightTimeoutError:
-                        steps[-1].detail = "timeout"
-                        steps[-1].status = "skipped"
-                        return exec_rec
+    The browser context is launched (or attached via CDP) once and every post gets a fresh
+    page in it, so N posts pay the browser cold-start only once. `login_hold` is applied to
+    the first post only; the login state is shared by the context. `verify_by_title` is
+    passed through to _save_draft_on_page.
 
-                    _step("wait_for_draft_cover", "in_progress", "")
-                    cover_ready = False
-                    try:
-                        cover_ready = _wait_for_draft_cover(page, post.title)
-                        steps[-1].detail = f"ready={cover_ready}"
-                        steps[-1].status = "success"
-                    except Exception as exc:
-                        steps[-1].detail = f"error: {exc}"
-                        steps[-1].status = "skipped"
-
-                    _step("snapshot_draft_box", "in_progress", "")
-                    try:
-                        draft_shot = ev_dir / "draft_box.png"
-                        page.screenshot(path=str(draft_shot), full_page=True)
-                        steps[-1].detail = f"saved to {draft_shot}"
-                        steps[-1].status = "success"
-                    except Exception as exc:
-                        steps[-1].detail = f"error: {exc}"
-                        steps[-1].status = "skipped"
-
-                    _step("html_draft_box", "in_progress", "")
-                    try:
-                        draft_html = ev_dir / "draft_box.html"
-                        draft_html.write_text(page.content(), encoding="utf-8")
-                        steps[-1].detail = f"saved to {draft_html}"
-                        steps[-1].status = "success"
-                    except Exception as exc:
-                        steps[-1].detail = f"error: {exc}"
-                        steps[-1].status = "skipped"
-
-                    _step("verify_draft_box_item", "in_progress", "")
+    Yields one Execution per job, in order, each already persisted via save_execution.
+    """
+    pending = iter(jobs)
+    launch_error: Optional[str] = None
+    launch_detail = ""
+
+    def _finish(exec_rec: Execution, steps: List[StepResult]) -> Execution:
+        exec_rec.steps = steps
+        save_execution(exec_rec)
+        return exec_rec
+
+    try:
+        profile_dir, channel, args = _resolve_profile_config()
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        launch_detail = str(profile_dir)
+
+        with sync_playwright() as p:
+            context, should_close_context, launch_detail = _launch_context(
+                p, profile_dir, channel, args
+            )
+            try:
+                for index, (post, assets, execution) in enumerate(pending):
+                    exec_rec = execution or Execution(post_id=post.id, result="pending")
+                    steps = [StepResult(name="launch", status="success", detail=launch_detail)]
+                    page = None
+                    opened = False
                     try:
-                        verified = _verify_draft_item(page, post.title)
-                        steps[-1].detail = f"verified={verified} cover_ready={cover_ready}"
-                        steps[-1].status = "success" if (verified and cover_ready) else "skipped"
-                    except Exception as exc:
-                        steps[-1].detail = f"error: {exc}"
-                        steps[-1].status = "skipped"
-                except Exception as exc:
-                    # Do not fail the whole run after the draft has already been saved.
-                    _step("draft_box_optional", "skipped", f"error: {exc}")
-                    return exec_rec
+                        # The launch tab serves the first post; later posts get their own tab.
+                        page, opened = _acquire_page(context, should_close_context, fresh=index > 0)
+                        _save_draft_on_page(
+                            page,
+                            post,
+                            exec_rec=exec_rec,
+                            steps=steps,
+                            assets=[os.path.normpath(a) for a in (assets or []) if os.path.isfile(a)],
+                            dry_run=dry_run,
+                            login_hold=login_hold if index == 0 else 0,
+                            login_only=False,
+                            wait_timeout_ms=wait_timeout_ms,
+                            verify_by_title=verify_by_title,
+                        )
+                    except Exception as exc:  # pragma: no cover
+                        exec_rec.result = "failed"
+                        exec_rec.error = {"message": str(exc)}
+                    finally:
+                        if page is not None and opened:
+                            try:
+                                page.close()
+                            except Exception:
+                                pass
+                    yield _finish(exec_rec, steps)
             finally:
                 if should_close_context:
                     context.close()
     except Exception as exc:  # pragma: no cover
+        launch_error = str(exc)
+
+    if launch_error is None:
+        return
+    # The session could not be started (or died): fail the jobs that never ran.
+    for post, _assets, execution in pending:
+        exec_rec = execution or Execution(post_id=post.id, result="pending")
         exec_rec.result = "failed"
-        exec_rec.error = {"message": str(exc)}
-    finally:
-        exec_rec.steps = steps
-        save_execution(exec_rec)
+        exec_rec.error = {"message": launch_error}
+        steps = [StepResult(name="launch", status="failed", detail=launch_detail)]
+        yield _finish(exec_rec, steps)
 
-    return exec_rec
+
+def effective_concurrency(concurrency: int, job_count: int) -> int:
+    """Worker count run_save_draft_parallel_sync will use: 1 unless XHS_CDP_URL is set."""
+    workers = max(1, min(int(concurrency or 1), job_count))
+    return workers if workers > 1 and _resolve_cdp_url() else 1
+
+
+def run_save_draft_parallel_sync(
+    jobs: Iterable[tuple[Post, Optional[list[str]], Optional[Execution]]],
+    *,
+    concurrency: int = 1,
+    dry_run: bool = False,
+    login_hold: int = 0,
+    wait_timeout_ms: int = WAIT_TIMEOUT_MS,
+) -> Iterator[Execution]:
+    """
+    Spread save-draft jobs over up to `concurrency` worker threads.
+
+    Playwright's sync API is bound to the thread that started it, so each worker runs its
+    own run_save_draft_batch_sync session. A persistent profile directory can only be opened
+    by one browser at a time, so parallel sessions require XHS_CDP_URL (every worker attaches
+    to the same Chrome); without it this degrades to a single batch. Parallel workers verify
+    each save by its title, never by the account-wide draft counter.
+
+    Executions are yielded as workers finish, not in job order.
+    """
+    jobs = list(jobs)
+    workers = effective_concurrency(concurrency, len(jobs))
+    if workers <= 1:
+        yield from run_save_draft_batch_sync(
+            jobs, dry_run=dry_run, login_hold=login_hold, wait_timeout_ms=wait_timeout_ms
+        )
+        return
+
+    def _work(chunk: list) -> list[Execution]:
+        return list(
+            run_save_draft_batch_sync(
+                chunk,
+                dry_run=dry_run,
+                login_hold=login_hold,
+                wait_timeout_ms=wait_timeout_ms,
+                verify_by_title=True,
+            )
+        )
+
+    chunks = [jobs[i::workers] for i in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_work, chunk) for chunk in chunks]
+        for fut in as_completed(futures):
+            yield from fut.result()
 
 
 def run_delete_drafts_sync(
@@ -1372,16 +1570,51 @@ def run_delete_drafts_sync(
     login_hold: int = 0,
     wait_timeout_ms: int = WAIT_TIMEOUT_MS,
 ) -> dict:
-    result = {
-        "draft_type": draft_type,
-        "draft_location": draft_location,
-        "draft_url": draft_url or "",
-        "total": 0,
-        "deleted": 0,
-        "items": [],
-        "errors": [],
-    }
+    return run_delete_drafts_batch_sync(
+        draft_types=[draft_type],
+        draft_location=draft_location,
+        draft_url=draft_url,
+        limit=limit,
+        dry_run=dry_run,
+        login_hold=login_hold,
+        wait_timeout_ms=wait_timeout_ms,
+    )[0]
+
+
+def run_delete_drafts_batch_sync(
+    *,
+    draft_types: list[str],
+    draft_location: str = "publish",
+    draft_url: str = "",
+    limit: int = 0,
+    dry_run: bool = False,
+    login_hold: int = 0,
+    wait_timeout_ms: int = WAIT_TIMEOUT_MS,
+) -> list[dict]:
+    """
+    Preview/delete drafts for several draft types within ONE browser session.
+
+    Returns one result dict per entry of `draft_types` (same shape as run_delete_drafts_sync).
+    `login_hold` is applied before the first type only.
+    """
+    results = [
+        {
+            "draft_type": draft_type,
+            "draft_location": draft_location,
+            "draft_url": draft_url or "",
+            "total": 0,
+            "deleted": 0,
+            "items": [],
+            "errors": [],
+        }
+        for draft_type in draft_types
+    ]
+    # Evidence is per draft type, like separate run_delete_drafts_sync calls.
     evidence_dir: Optional[Path] = None
+    failure_count = 0
+    # results[:finished] are done (event saved or own error recorded); a session-level
+    # crash is only reported on the rest.
+    finished = 0
 
     profile_dir, channel, args = _resolve_profile_config()
     profile_dir.mkdir(parents=True, exist_ok=True)
@@ -1397,7 +1630,7 @@ def run_delete_drafts_sync(
             context.set_default_timeout(30000)
             page = context.pages[0] if context.pages else context.new_page()
             location = (draft_location or "publish").strip().lower()
-            failure_count = 0
+            login_pending = login_hold > 0
 
             def _ensure_evidence_dir() -> Path:
                 nonlocal evidence_dir
@@ -1440,9 +1673,11 @@ def run_delete_drafts_sync(
                 page.goto(draft_url, wait_until="domcontentloaded")
 
             def _collect_for_type(dtype: str) -> list[dict[str, str]]:
+                nonlocal login_pending
                 _goto_draft_page(dtype)
 
-                if login_hold > 0:
+                if login_pending:
+                    login_pending = False
                     time.sleep(login_hold)
                 if location == "publish":
                     _wait_for_any_text(page, WAIT_TEXTS, wait_timeout_ms)
@@ -1467,22 +1702,16 @@ def run_delete_drafts_sync(
                     time.sleep(1)
                 return _collect_draft_items(page, limit=None)
 
-            if dry_run:
-                total_items = _collect_for_type(draft_type)
+            def _collect_into(result: dict) -> None:
+                total_items = _collect_for_type(result["draft_type"])
                 result["total"] = len(total_items)
                 if limit and limit > 0:
                     result["items"] = total_items[:limit]
                 else:
                     result["items"] = total_items
-                return result
 
-            def _delete_for_type(dtype: str) -> None:
-                total_items = _collect_for_type(dtype)
-                result["total"] = len(total_items)
-                if limit and limit > 0:
-                    result["items"] = total_items[:limit]
-                else:
-                    result["items"] = total_items
+            def _delete_for_type(result: dict) -> None:
+                _collect_into(result)
 
                 target = len(result["items"])
                 deleted_titles: list[str] = []
@@ -1534,21 +1763,33 @@ def run_delete_drafts_sync(
                 result["deleted"] = len(deleted_titles)
                 result["deleted_titles"] = deleted_titles
 
-            _delete_for_type(draft_type)
-            if evidence_dir is not None:
-                result["evidence_dir"] = str(evidence_dir)
-
-            event_path = save_event(
-                {
-                    "type": "delete_drafts",
-                    "draft_type": draft_type,
-                    "dry_run": dry_run,
-                    "profile_dir": str(profile_dir),
-                    "summary": result,
-                }
-            )
-            result["event_path"] = str(event_path)
-            return result
+            for result in results:
+                evidence_dir = None
+                failure_count = 0
+                try:
+                    if dry_run:
+                        _collect_into(result)
+                        continue
+
+                    _delete_for_type(result)
+                    if evidence_dir is not None:
+                        result["evidence_dir"] = str(evidence_dir)
+
+                    event_path = save_event(
+                        {
+                            "type": "delete_drafts",
+                            "draft_type": result["draft_type"],
+                            "dry_run": dry_run,
+                            "profile_dir": str(profile_dir),
+                            "summary": result,
+                        }
+                    )
+                    result["event_path"] = str(event_path)
+                except Exception as exc:
+                    result["errors"].append(str(exc))
+                finally:
+                    finished += 1
     except Exception as exc:
-        result["errors"].append(str(exc))
-        return result
+        for result in results[finished:]:
+            result["errors"].append(str(exc))
+    return results
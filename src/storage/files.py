@@ -1,15 +1,28 @@
 from __future__ import annotations
 
+import glob
 import json
 import os
+import re
 import shutil
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Iterable, Optional
 
-from .models import Execution, Post, Revision
+from .models import Execution, Post, PostStatus, PostType, Revision
 
 DATA_ROOT = Path("data")
 
+_GLOB_MAGIC_RE = re.compile(r"[*?[]")
+
+
+@dataclass(frozen=True)
+class PostSummary:
+    id: str
+    type: PostType
+    status: PostStatus
+    title: str
+
 
 def ensure_dirs(base: Path = DATA_ROOT) -> None:
     (base / "posts").mkdir(parents=True, exist_ok=True)
@@ -18,7 +31,9 @@ def ensure_dirs(base: Path = DATA_ROOT) -> None:
 
 
 def _write_json_atomic(path: Path, obj: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
+    # Post dirs usually exist already; one stat is cheaper than mkdir failing with EEXIST.
+    if not path.parent.is_dir():
+        path.parent.mkdir(parents=True, exist_ok=True)
     tmp = path.with_suffix(path.suffix + ".tmp")
     tmp.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
     os.replace(tmp, path)
@@ -72,6 +87,40 @@ def list_posts(base: Path = DATA_ROOT) -> Iterable[Post]:
     return posts
 
 
+def list_posts_summary(base: Path = DATA_ROOT) -> list[PostSummary]:
+    """
+    List posts with only the fields needed for display.
+
+    Reads each post.json as plain JSON and skips pydantic validation of the full model
+    (assets/settings/platform), which dominates list_posts() on large data dirs.
+    """
+    root = base / "posts"
+    summaries: list[PostSummary] = []
+    try:
+        entries = os.scandir(root)
+    except FileNotFoundError:
+        return summaries
+    with entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            try:
+                data = _read_json(Path(entry.path) / "post.json")
+                if not isinstance(data, dict) or not data.get("id"):
+                    continue
+                # Same enum members as Post, so `list` output matches the full-model path.
+                summary = PostSummary(
+                    id=str(data["id"]),
+                    type=PostType(data.get("type") or PostType.image),
+                    status=PostStatus(data.get("status") or PostStatus.draft),
+                    title=str(data.get("title") or ""),
+                )
+            except Exception:
+                continue
+            summaries.append(summary)
+    return summaries
+
+
 def save_revision(revision: Revision, base: Path = DATA_ROOT) -> Path:
     path = revision_path(revision.post_id, revision.id, base)
     _write_json_atomic(path, revision.model_dump())
@@ -115,3 +164,25 @@ def copy_assets_into_post(post_id: str, asset_paths: list[Path], base: Path = DA
         shutil.copy2(src, target)
         copied.append(target)
     return copied
+
+
+def glob_files(pattern: str) -> list[str]:
+    """
+    List regular files matching a glob pattern.
+
+    The common `<dir>/*` shape is served by a single os.scandir() pass (DirEntry caches
+    the file type, so no extra stat per entry); other patterns fall back to glob.
+    """
+    head, tail = os.path.split(pattern)
+    if tail == "*" and not _GLOB_MAGIC_RE.search(head):
+        try:
+            with os.scandir(head or ".") as it:
+                # Match glob semantics: "*" does not pick up hidden files.
+                return [
+                    os.path.join(head, e.name)
+                    for e in it
+                    if not e.name.startswith(".") and e.is_file()
+                ]
+        except OSError:
+            return []
+    return [p for p in glob.iglob(pattern) if os.path.isfile(p)]
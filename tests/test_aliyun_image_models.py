@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+import os
+import threading
+import time
 from pathlib import Path
 
+import pytest
+
 from src.images import aliyun_images
 
 
@@ -24,11 +30,11 @@ def test_wan26_forces_n_to_1(monkeypatch, tmp_path: Path):
             "request_id": "req",
         }
 
-    def fake_download_bytes(*, url, timeout_s):
-        return b"\x89PNG\r\n\x1a\n" + b"x" * 64
+    def fake_download_to_file(*, url, dest, timeout_s):
+        dest.write_bytes(b"\x89PNG\r\n\x1a\n" + b"x" * 64)
 
     monkeypatch.setattr(aliyun_images, "_http_post_json", fake_post_json)
-    monkeypatch.setattr(aliyun_images, "_download_bytes", fake_download_bytes)
+    monkeypatch.setattr(aliyun_images, "_download_to_file", fake_download_to_file)
 
     res = aliyun_images.generate_aliyun_image(post_id="p", prompt="hi", dest_dir=tmp_path)
 
@@ -58,11 +64,11 @@ def test_z_image_does_not_send_negative_prompt(monkeypatch, tmp_path: Path):
             }
         }
 
-    def fake_download_bytes(*, url, timeout_s):
-        return b"\x89PNG\r\n\x1a\n" + b"x" * 64
+    def fake_download_to_file(*, url, dest, timeout_s):
+        dest.write_bytes(b"\x89PNG\r\n\x1a\n" + b"x" * 64)
 
     monkeypatch.setattr(aliyun_images, "_http_post_json", fake_post_json)
-    monkeypatch.setattr(aliyun_images, "_download_bytes", fake_download_bytes)
+    monkeypatch.setattr(aliyun_images, "_download_to_file", fake_download_to_file)
 
     aliyun_images.generate_aliyun_image(post_id="p", prompt="hi", dest_dir=tmp_path)
 
@@ -89,12 +95,12 @@ def test_wan25_auto_uses_async_text2image_and_polls(monkeypatch, tmp_path: Path)
         seen["get_url"] = url
         return {"output": {"task_status": "SUCCEEDED", "results": [{"url": "https://example.com/out.png"}]}}
 
-    def fake_download_bytes(*, url, timeout_s):
-        return b"\x89PNG\r\n\x1a\n" + b"x" * 64
+    def fake_download_to_file(*, url, dest, timeout_s):
+        dest.write_bytes(b"\x89PNG\r\n\x1a\n" + b"x" * 64)
 
     monkeypatch.setattr(aliyun_images, "_http_post_json", fake_post_json)
     monkeypatch.setattr(aliyun_images, "_http_get_json", fake_get_json)
-    monkeypatch.setattr(aliyun_images, "_download_bytes", fake_download_bytes)
+    monkeypatch.setattr(aliyun_images, "_download_to_file", fake_download_to_file)
 
     res = aliyun_images.generate_aliyun_image(post_id="p", prompt="hi", dest_dir=tmp_path)
 
@@ -104,3 +110,378 @@ def test_wan25_auto_uses_async_text2image_and_polls(monkeypatch, tmp_path: Path)
     assert res.meta["task_id"] == "task123"
     assert res.meta["method"].startswith("text2image_synthesis_async")
 
+
+
+def test_async_generations_overlap_without_clobbering(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("ALIYUN_IMAGE_API_KEY", "dummy")
+    monkeypatch.setenv("ALIYUN_IMAGE_BASE_URL", "https://example.com")
+    monkeypatch.setenv("ALIYUN_IMAGE_MODEL", "qwen-image-plus")
+
+    def fake_post_json(*, url, payload, headers, timeout_s):
+        text = payload["input"]["messages"][0]["content"][0]["text"]
+        return {"output": {"choices": [{"message": {"content": [{"image": f"https://example.com/{text}.png"}]}}]}}
+
+    def fake_download_to_file(*, url, dest, timeout_s):
+        dest.write_bytes(url.encode("utf-8"))
+
+    monkeypatch.setattr(aliyun_images, "_http_post_json", fake_post_json)
+    monkeypatch.setattr(aliyun_images, "_download_to_file", fake_download_to_file)
+
+    async def _run():
+        return await asyncio.gather(
+            *(
+                aliyun_images.generate_aliyun_image_async(post_id="p", prompt=f"p{i}", dest_dir=tmp_path)
+                for i in range(3)
+            )
+        )
+
+    results = asyncio.run(_run())
+
+    assert len({r.path for r in results}) == 3
+    assert sorted(r.path.read_bytes() for r in results) == [
+        b"https://example.com/p0.png",
+        b"https://example.com/p1.png",
+        b"https://example.com/p2.png",
+    ]
+
+
+def test_batch_caps_concurrency_and_keeps_failures(monkeypatch, tmp_path: Path):
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fake_generate(*, post_id, prompt, dest_dir, **kwargs):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.05)
+        with lock:
+            state["active"] -= 1
+        if prompt == "bad":
+            raise RuntimeError("boom")
+        return aliyun_images.AliyunImageResult(path=dest_dir / f"{prompt}.png", meta={})
+
+    monkeypatch.setattr(aliyun_images, "generate_aliyun_image", fake_generate)
+
+    prompts = ["a", "bad", "c", "d", "e"]
+    results = asyncio.run(
+        aliyun_images.generate_aliyun_images_async(
+            [{"post_id": "p", "prompt": p, "dest_dir": tmp_path} for p in prompts],
+            max_concurrent=2,
+        )
+    )
+
+    assert state["peak"] == 2
+    assert isinstance(results[1], RuntimeError)
+    assert [r.path.stem for i, r in enumerate(results) if i != 1] == ["a", "c", "d", "e"]
+
+
+def test_failed_download_leaves_no_partial_file(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("ALIYUN_IMAGE_API_KEY", "dummy")
+    monkeypatch.setenv("ALIYUN_IMAGE_BASE_URL", "https://example.com")
+    monkeypatch.setenv("ALIYUN_IMAGE_MODEL", "qwen-image-plus")
+
+    def fake_post_json(*, url, payload, headers, timeout_s):
+        return {"output": {"choices": [{"message": {"content": [{"image": "https://example.com/out.png"}]}}]}}
+
+    def fake_download_to_file(*, url, dest, timeout_s):
+        dest.write_bytes(b"partial")
+        raise RuntimeError("Aliyun image download failed: reset")
+
+    monkeypatch.setattr(aliyun_images, "_http_post_json", fake_post_json)
+    monkeypatch.setattr(aliyun_images, "_download_to_file", fake_download_to_file)
+
+    with pytest.raises(RuntimeError):
+        aliyun_images.generate_aliyun_image(post_id="p", prompt="hi", dest_dir=tmp_path)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_poll_backs_off_and_resets_when_running(monkeypatch):
+    statuses = iter(["PENDING", "PENDING", "PENDING", "RUNNING", "RUNNING", "SUCCEEDED"])
+    sleeps: list[float] = []
+
+    def fake_get_json(*, url, headers, timeout_s):
+        return {"output": {"task_status": next(statuses)}}
+
+    monkeypatch.setattr(aliyun_images, "_http_get_json", fake_get_json)
+    monkeypatch.setattr(aliyun_images.time, "sleep", sleeps.append)
+    monkeypatch.setattr(aliyun_images.random, "uniform", lambda a, b: 1.0)
+
+    cfg = aliyun_images.AliyunImageConfig(api_key="k", base_url="https://example.com", region="cn-beijing")
+    resp = aliyun_images._poll_task_result(
+        cfg=cfg,
+        task_id="t",
+        poll_timeout_s=60,
+        poll_max_interval_s=5.0,
+        query_timeout_s=5,
+        poll_initial_delay_s=1.0,
+        poll_backoff=1.5,
+    )
+
+    assert resp["output"]["task_status"] == "SUCCEEDED"
+    assert sleeps == pytest.approx([1.0, 1.5, 2.25, 1.0, 1.5], abs=0.05)
+
+
+@pytest.mark.parametrize(
+    ("env", "expected"),
+    [
+        ({}, (1.0, 5.0)),
+        ({"ALIYUN_IMAGE_POLL_INITIAL_DELAY_S": "0.5", "ALIYUN_IMAGE_POLL_MAX_INTERVAL_S": "8"}, (0.5, 8.0)),
+        # The pre-backoff setting still means one fixed interval.
+        ({"ALIYUN_IMAGE_POLL_INTERVAL_S": "2", "ALIYUN_IMAGE_POLL_MAX_INTERVAL_S": "8"}, (2.0, 2.0)),
+    ],
+)
+def test_poll_interval_env(monkeypatch, tmp_path: Path, env, expected):
+    monkeypatch.setenv("ALIYUN_IMAGE_API_KEY", "dummy")
+    monkeypatch.setenv("ALIYUN_IMAGE_BASE_URL", "https://example.com")
+    monkeypatch.setenv("ALIYUN_IMAGE_MODEL", "wan2.5-t2i")
+    for name in ("ALIYUN_IMAGE_POLL_INTERVAL_S", "ALIYUN_IMAGE_POLL_INITIAL_DELAY_S", "ALIYUN_IMAGE_POLL_MAX_INTERVAL_S"):
+        monkeypatch.delenv(name, raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    seen: dict[str, float] = {}
+
+    def fake_poll(**kwargs):
+        seen["initial"] = kwargs["poll_initial_delay_s"]
+        seen["max"] = kwargs["poll_max_interval_s"]
+        return {"output": {"task_status": "SUCCEEDED", "results": [{"url": "https://example.com/out.png"}]}}
+
+    monkeypatch.setattr(
+        aliyun_images, "_http_post_json", lambda **kw: {"output": {"task_id": "t", "task_status": "PENDING"}}
+    )
+    monkeypatch.setattr(aliyun_images, "_poll_task_result", fake_poll)
+    monkeypatch.setattr(aliyun_images, "_download_to_file", lambda *, url, dest, timeout_s: dest.write_bytes(b"x"))
+
+    aliyun_images.generate_aliyun_image(post_id="p", prompt="hi", dest_dir=tmp_path)
+
+    assert (seen["initial"], seen["max"]) == expected
+
+
+def test_config_cache_follows_key_file_changes(monkeypatch, tmp_path: Path):
+    for name in ("ALIYUN_IMAGE_API_KEY", "DASHSCOPE_API_KEY", "ALIYUN_IMAGE_BASE_URL", "ALIYUN_IMAGE_REGION"):
+        monkeypatch.delenv(name, raising=False)
+    key_file = tmp_path / "aliyun_image_api-key.md"
+    key_file.write_text('api_key="k1"\nregion="cn-hangzhou"\n', encoding="utf-8")
+
+    cfg = aliyun_images.load_aliyun_image_config(key_file=key_file)
+    assert (cfg.api_key, cfg.region) == ("k1", "cn-hangzhou")
+    assert aliyun_images.load_aliyun_image_config(key_file=key_file) is cfg
+
+    key_file.write_text('api_key="k2"\n', encoding="utf-8")
+    st = key_file.stat()
+    os.utime(key_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    cfg = aliyun_images.load_aliyun_image_config(key_file=key_file)
+    assert (cfg.api_key, cfg.region) == ("k2", "cn-beijing")
+
+    monkeypatch.setenv("ALIYUN_IMAGE_API_KEY", "env-key")
+    assert aliyun_images.load_aliyun_image_config(key_file=key_file).api_key == "env-key"
+
+
+def test_extractors_tolerate_malformed_responses():
+    ok_sync = {"output": {"choices": [{"message": {"content": [{"url": " https://x/a.png "}]}}]}}
+    assert aliyun_images._extract_sync_image_urls(ok_sync) == ["https://x/a.png"]
+    assert aliyun_images._extract_task_image_urls({"output": {"results": [{"url": "https://x/b.png"}]}}) == [
+        "https://x/b.png"
+    ]
+    assert aliyun_images._extract_task_image_urls({"output": {"results": [{}], **ok_sync["output"]}}) == [
+        "https://x/a.png"
+    ]
+    assert aliyun_images._extract_task_status({"output": {"task_status": " RUNNING "}}) == "RUNNING"
+
+    for bad in ({}, {"output": None}, {"output": "x"}, {"output": {"choices": []}}, {"output": {"choices": [None]}},
+                {"output": {"choices": [{"message": {"content": ["x"]}}]}},
+                {"output": {"choices": [{"message": {"content": [{"image": 1}]}}]}}):
+        with pytest.raises(RuntimeError):
+            aliyun_images._extract_sync_image_urls(bad)
+        assert aliyun_images._extract_task_status(bad) == ""
+    for bad in ({}, {"output": []}, {"output": {"task_id": "  "}}, {"output": {"task_id": 5}}):
+        with pytest.raises(RuntimeError):
+            aliyun_images._extract_task_id(bad)
+
+
+def test_same_prompt_batch_uses_one_wan_task(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("ALIYUN_IMAGE_API_KEY", "dummy")
+    monkeypatch.setenv("ALIYUN_IMAGE_BASE_URL", "https://example.com")
+    monkeypatch.setenv("ALIYUN_IMAGE_MODEL", "wan2.5-t2i")
+    monkeypatch.setenv("ALIYUN_IMAGE_POLL_INTERVAL_S", "0")
+
+    posts: list[dict] = []
+
+    def fake_post_json(*, url, payload, headers, timeout_s):
+        posts.append(payload)
+        return {"output": {"task_id": "task123", "task_status": "PENDING"}}
+
+    def fake_get_json(*, url, headers, timeout_s):
+        return {
+            "output": {
+                "task_status": "SUCCEEDED",
+                "results": [{"url": f"https://example.com/{i}.png"} for i in range(3)],
+            }
+        }
+
+    def fake_download_to_file(*, url, dest, timeout_s):
+        dest.write_bytes(url.encode("utf-8"))
+
+    monkeypatch.setattr(aliyun_images, "_http_post_json", fake_post_json)
+    monkeypatch.setattr(aliyun_images, "_http_get_json", fake_get_json)
+    monkeypatch.setattr(aliyun_images, "_download_to_file", fake_download_to_file)
+
+    results = aliyun_images.generate_aliyun_images_same_prompt(post_id="p", prompt="hi", dest_dir=tmp_path, n=3)
+
+    assert len(posts) == 1
+    assert posts[0]["parameters"]["n"] == 3
+    assert [r.path.read_bytes() for r in results] == [f"https://example.com/{i}.png".encode() for i in range(3)]
+    assert [r.meta["index"] for r in results] == [0, 1, 2]
+    assert len({r.path for r in results}) == 3
+
+
+def test_model_traits_classification():
+    t = aliyun_images._model_traits
+    assert (t("wan2.6-t2i").is_wan26, t("wan2.6-t2i").is_text2image_async) == (True, False)
+    assert (t(" WAN2.5-t2i-preview ").is_wan26, t(" WAN2.5-t2i-preview ").is_text2image_async) == (False, True)
+    assert t("wanx-v1").is_text2image_async
+    assert not t("qwen-image-plus").is_text2image_async
+    assert t("qwen-image-plus").supports_negative_prompt
+    assert not t("z-image-turbo").supports_negative_prompt
+
+
+def test_cache_dir_skips_repeat_generation(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("ALIYUN_IMAGE_API_KEY", "dummy")
+    monkeypatch.setenv("ALIYUN_IMAGE_BASE_URL", "https://example.com")
+    monkeypatch.setenv("ALIYUN_IMAGE_MODEL", "qwen-image-plus")
+    monkeypatch.setenv("ALIYUN_IMAGE_CACHE_DIR", str(tmp_path / "cache"))
+
+    calls = {"post": 0}
+
+    def fake_post_json(*, url, payload, headers, timeout_s):
+        calls["post"] += 1
+        return {"output": {"choices": [{"message": {"content": [{"image": "https://example.com/out.jpg"}]}}]}}
+
+    def fake_download_to_file(*, url, dest, timeout_s):
+        dest.write_bytes(b"jpeg-bytes")
+
+    monkeypatch.setattr(aliyun_images, "_http_post_json", fake_post_json)
+    monkeypatch.setattr(aliyun_images, "_download_to_file", fake_download_to_file)
+
+    first = aliyun_images.generate_aliyun_image(post_id="p1", prompt="hi", dest_dir=tmp_path / "p1")
+    second = aliyun_images.generate_aliyun_image(post_id="p2", prompt="hi", dest_dir=tmp_path / "p2")
+    other = aliyun_images.generate_aliyun_image(post_id="p3", prompt="other", dest_dir=tmp_path / "p3")
+
+    assert calls["post"] == 2
+    assert "cache_hit" not in first.meta
+    assert second.meta["cache_hit"] is True
+    assert second.path.suffix == ".jpg"
+    assert second.path.read_bytes() == b"jpeg-bytes"
+    assert "cache_hit" not in other.meta
+
+
+def test_cache_dir_does_not_repeat_multi_image_requests(monkeypatch, tmp_path: Path):
+    from src.images.auto_image import fetch_and_download_related_images
+
+    monkeypatch.setenv("ALIYUN_IMAGE_API_KEY", "dummy")
+    monkeypatch.setenv("ALIYUN_IMAGE_BASE_URL", "https://example.com")
+    monkeypatch.setenv("ALIYUN_IMAGE_MODEL", "qwen-image-plus")
+    monkeypatch.setenv("ALIYUN_IMAGE_CACHE_DIR", str(tmp_path / "cache"))
+
+    calls = {"post": 0}
+
+    def fake_post_json(*, url, payload, headers, timeout_s):
+        calls["post"] += 1
+        img = f"https://example.com/out{calls['post']}.jpg"
+        return {"output": {"choices": [{"message": {"content": [{"image": img}]}}]}}
+
+    def fake_download_to_file(*, url, dest, timeout_s):
+        dest.write_bytes(url.encode())
+
+    monkeypatch.setattr(aliyun_images, "_http_post_json", fake_post_json)
+    monkeypatch.setattr(aliyun_images, "_download_to_file", fake_download_to_file)
+
+    # Prime the cache so any cache lookup below would hit.
+    aliyun_images.generate_aliyun_image(post_id="p0", prompt="hi", dest_dir=tmp_path / "p0")
+    calls["post"] = 0
+    res = aliyun_images.generate_aliyun_images_same_prompt(post_id="p1", prompt="hi", dest_dir=tmp_path / "p1", n=3)
+    assert calls["post"] == 3
+    assert len({r.path.read_bytes() for r in res}) == 3
+
+    monkeypatch.setattr("src.images.auto_image._build_aliyun_image_prompt", lambda **kw: "hi")
+    calls["post"] = 0
+    paths, metas = fetch_and_download_related_images(
+        title="t", body="b", topics=[], prompt_hint="", dest_dir=tmp_path / "p2", provider="aliyun", count=3
+    )
+    assert calls["post"] == 3
+    assert len({p.read_bytes() for p in paths}) == 3
+    assert not any(m.get("cache_hit") for m in metas)
+
+
+def test_guess_ext_reads_url_path_only():
+    g = aliyun_images._guess_ext
+    assert g("https://cdn.example.com/a/b/out.PNG?Expires=1&Signature=x.jpg") == ".png"
+    assert g("https://cdn.example.com/out.jpeg#frag") == ".jpg"
+    assert g("https://cdn.example.com/out.webp") == ".webp"
+    assert g("https://cdn.example.com/v1.2/noext") == ".png"
+    assert g("") == ".png"
+
+
+def test_poll_stops_when_cancel_event_is_set(monkeypatch):
+    cancel = threading.Event()
+    calls = {"get": 0}
+
+    def fake_get_json(*, url, headers, timeout_s):
+        calls["get"] += 1
+        cancel.set()
+        return {"output": {"task_status": "RUNNING"}}
+
+    monkeypatch.setattr(aliyun_images, "_http_get_json", fake_get_json)
+
+    cfg = aliyun_images.AliyunImageConfig(api_key="k", base_url="https://example.com", region="cn-beijing")
+    started = time.monotonic()
+    with pytest.raises(aliyun_images.AliyunImageCancelled):
+        aliyun_images._poll_task_result(
+            cfg=cfg,
+            task_id="t",
+            poll_timeout_s=60,
+            poll_max_interval_s=30.0,
+            query_timeout_s=5,
+            poll_initial_delay_s=30.0,
+            cancel=cancel,
+        )
+    assert calls["get"] == 1
+    assert time.monotonic() - started < 5
+
+
+def test_sync_not_supported_falls_back_to_wan26_task(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("ALIYUN_IMAGE_API_KEY", "dummy")
+    monkeypatch.setenv("ALIYUN_IMAGE_BASE_URL", "https://example.com")
+    monkeypatch.setenv("ALIYUN_IMAGE_MODEL", "wan2.6-t2i")
+    monkeypatch.setenv("ALIYUN_IMAGE_POLL_INTERVAL_S", "0")
+
+    posts: list[tuple[str, dict, dict]] = []
+
+    def fake_post_json(*, url, payload, headers, timeout_s):
+        posts.append((url, payload, headers))
+        if len(posts) == 1:
+            raise aliyun_images.AliyunImageAPIError(
+                url=url, status=400, code="InvalidParameter", message="This model does not support synchronous calls"
+            )
+        return {"output": {"task_id": "t9", "task_status": "PENDING"}}
+
+    def fake_get_json(*, url, headers, timeout_s):
+        return {"output": {"task_status": "SUCCEEDED", "results": [{"url": "https://example.com/out.png"}]}}
+
+    def fake_download_to_file(*, url, dest, timeout_s):
+        dest.write_bytes(b"png")
+
+    monkeypatch.setattr(aliyun_images, "_http_post_json", fake_post_json)
+    monkeypatch.setattr(aliyun_images, "_http_get_json", fake_get_json)
+    monkeypatch.setattr(aliyun_images, "_download_to_file", fake_download_to_file)
+
+    res = aliyun_images.generate_aliyun_image(post_id="p", prompt="hi", dest_dir=tmp_path)
+
+    assert [u.rsplit("/aigc/", 1)[1] for u, _, _ in posts] == [
+        "multimodal-generation/generation",
+        "image-generation/generation",
+    ]
+    assert "X-DashScope-Async" not in posts[0][2]
+    assert posts[1][2]["X-DashScope-Async"] == "enable"
+    assert posts[1][1]["parameters"]["n"] == 1
+    assert res.meta["method"] == "wan26_generation_async_fallback"
+    assert res.meta["task_id"] == "t9"
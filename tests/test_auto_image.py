@@ -1,7 +1,15 @@
+import os
+import threading
+import time
+
+import pytest
+
+from src.images import auto_image
 from src.images.auto_image import (
     ImageItem,
     _pexels_query_hint,
     build_image_query,
+    fetch_and_download_related_images,
     is_auto_image_enabled,
     pick_best_image,
     pick_top_images,
@@ -86,6 +94,11 @@ def test_pexels_query_hint_avoids_news_when_specific():
     assert "news" not in q
 
 
+def test_pexels_query_hint_keeps_table_order_for_traditional_keywords():
+    q = _pexels_query_hint("人工智能 製造 經濟 日本")
+    assert q == "Japan economy technology manufacturing"
+
+
 def test_pexels_query_hint_uses_news_when_only_news():
     q = _pexels_query_hint("新闻")
     assert q == "news"
@@ -141,6 +154,61 @@ def test_pick_best_image_tiebreaker_by_area():
     assert picked.id == "2"
 
 
+def test_pick_best_image_stops_at_unbeatable_candidate(monkeypatch):
+    items = [
+        ImageItem(
+            provider="pexels",
+            id=str(i),
+            page_url=f"https://example.com/{i}",
+            download_url=f"https://example.com/{i}.jpg",
+            alt="red fox in snow",
+            width=3000,
+            height=2000,
+        )
+        for i in range(1, 6)
+    ]
+    scored: list[str] = []
+    real_score = auto_image._relevance_score
+
+    def counting_score(item, q_tokens):
+        scored.append(item.id)
+        return real_score(item, q_tokens)
+
+    monkeypatch.setattr(auto_image, "_relevance_score", counting_score)
+    assert pick_best_image(items, "red fox").id == "1"
+    assert scored == ["1"]
+
+
+def test_pick_images_skip_small_crops_unless_nothing_else(monkeypatch):
+    monkeypatch.delenv("IMAGE_MIN_AREA", raising=False)
+    small = ImageItem(
+        provider="pexels",
+        id="small",
+        page_url="https://example.com/small",
+        download_url="https://example.com/small.jpg",
+        alt="harbor crane",
+        width=300,
+        height=400,
+    )
+    large = ImageItem(
+        provider="pexels",
+        id="large",
+        page_url="https://example.com/large",
+        download_url="https://example.com/large.jpg",
+        alt="harbor",
+        width=1200,
+        height=1600,
+    )
+    assert pick_best_image([small, large], "harbor crane").id == "large"
+    assert [p.id for p in pick_top_images([small, large], "harbor crane", count=1)] == ["large"]
+    # Like IMAGE_MIN_SCORE, the filter never leaves pick_top_images short of `count`.
+    assert len(pick_top_images([small, large], "harbor crane", count=2)) == 2
+    assert pick_best_image([small], "harbor crane").id == "small"
+
+    monkeypatch.setenv("IMAGE_MIN_AREA", "0")
+    assert pick_best_image([small, large], "harbor crane").id == "small"
+
+
 def test_pick_top_images_prefers_diverse_results():
     items = [
         ImageItem(
@@ -175,6 +243,35 @@ def test_pick_top_images_prefers_diverse_results():
     assert [p.id for p in picked] == ["1", "3"]
 
 
+def test_pick_top_images_finds_diverse_result_deep_in_ranking():
+    # 20 near-duplicates outrank the one distinct shot; diversity must still reach it.
+    items = [
+        ImageItem(
+            provider="pexels",
+            id=f"dup{i}",
+            page_url=f"https://example.com/dup{i}",
+            download_url=f"https://example.com/dup{i}.jpg",
+            alt="venezuela oil industry refinery",
+            width=1000,
+            height=1500,
+        )
+        for i in range(20)
+    ]
+    items.append(
+        ImageItem(
+            provider="pexels",
+            id="distinct",
+            page_url="https://example.com/distinct",
+            download_url="https://example.com/distinct.jpg",
+            alt="venezuela election politics",
+            width=1000,
+            height=1500,
+        )
+    )
+    picked = pick_top_images(items, "venezuela oil industry", count=2, min_score=0.0)
+    assert [p.id for p in picked] == ["dup0", "distinct"]
+
+
 def test_pick_top_images_respects_exclude_ids():
     items = [
         ImageItem(
@@ -198,3 +295,174 @@ def test_pick_top_images_respects_exclude_ids():
     ]
     picked = pick_top_images(items, "coffee", count=1, exclude_ids={"1"})
     assert picked[0].id == "2"
+
+
+def test_parallel_queries_overlap_fallback_search(monkeypatch, tmp_path):
+    monkeypatch.setenv("IMAGE_PARALLEL_QUERIES", "1")
+    monkeypatch.setenv("IMAGE_PROVIDER", "pexels")
+    monkeypatch.setattr(auto_image, "_load_pexels_config", lambda: ("k", "https://api.pexels.com"))
+    both_started = threading.Barrier(2, timeout=2)
+    searched: list[str] = []
+
+    def fake_search(*, api_key, base_url, query, per_page, orientation, timeout_s):
+        searched.append(query)
+        both_started.wait()  # deadlocks (BrokenBarrierError) if queries ran one after another
+        if query != "lifestyle":
+            return []
+        return [
+            ImageItem(
+                provider="pexels",
+                id="9",
+                page_url="https://example.com/9",
+                download_url="https://example.com/9.jpg",
+                alt="lifestyle",
+            )
+        ]
+
+    def fake_download(*, url, dest_path, timeout_s):
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        dest_path.write_bytes(b"img")
+
+    monkeypatch.setattr(auto_image, "_pexels_search_photos", fake_search)
+    monkeypatch.setattr(auto_image, "_download_image", fake_download)
+
+    t0 = time.monotonic()
+    paths, metas = fetch_and_download_related_images(
+        title="zzqx", body="", topics=[], prompt_hint="", dest_dir=tmp_path, count=1
+    )
+    assert time.monotonic() - t0 < 2
+    assert sorted(searched) == ["lifestyle", "zzqx"]
+    assert [m["query"] for m in metas] == ["lifestyle"]
+    assert paths[0].name == "auto_image_pexels_9.jpg"
+
+
+def test_download_image_leaves_no_partial_file_on_failure(monkeypatch, tmp_path):
+    def broken_request(*, method, url, body, headers, timeout_s, sink=None):
+        sink.write(b"half an image")
+        raise ConnectionResetError("peer reset")
+
+    monkeypatch.delenv("IMAGE_CACHE_DIR", raising=False)
+    monkeypatch.setattr(auto_image, "http_request", broken_request)
+    dest = tmp_path / "assets" / "1.jpg"
+    with pytest.raises(RuntimeError, match="peer reset"):
+        auto_image._download_image(url="https://example.com/1.jpg", dest_path=dest, timeout_s=1)
+    assert list(dest.parent.iterdir()) == []
+
+
+def test_load_pexels_config_reads_key_file_once_until_it_changes(monkeypatch, tmp_path):
+    for name in ("PEXELS_API_KEY", "PEXELS_BASE_URL"):
+        monkeypatch.delenv(name, raising=False)
+    parsed: list[str] = []
+    real_parse = auto_image._parse_kv_file
+    monkeypatch.setattr(auto_image, "_parse_kv_file", lambda p: parsed.append(p.name) or real_parse(p))
+    key_file = tmp_path / "pexels_api-key.md"
+    key_file.write_text('api_key="k1"\n', encoding="utf-8")
+
+    for _ in range(3):
+        assert auto_image._load_pexels_config(key_file=key_file) == ("k1", "https://api.pexels.com")
+    assert parsed == ["pexels_api-key.md"]
+
+    key_file.write_text('api_key="k2"\nbase_url="https://proxy.example/"\n', encoding="utf-8")
+    st = key_file.stat()
+    os.utime(key_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert auto_image._load_pexels_config(key_file=key_file) == ("k2", "https://proxy.example")
+
+    monkeypatch.setenv("PEXELS_API_KEY", "env-key")
+    assert auto_image._load_pexels_config(key_file=key_file)[0] == "env-key"
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_loads_parses_bytes_with_and_without_orjson(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(auto_image, "orjson", None)
+    elif auto_image.orjson is None:
+        pytest.skip("orjson not installed")
+    raw = '{"photos": [{"id": 1, "alt": "街头 咖啡"}]}'.encode("utf-8")
+    assert auto_image._json_loads(raw) == {"photos": [{"id": 1, "alt": "街头 咖啡"}]}
+
+
+def test_image_settings_cached_but_follow_env(monkeypatch):
+    for name in auto_image._SETTINGS_ENV:
+        monkeypatch.delenv(name, raising=False)
+    s = auto_image._image_settings()
+    assert (s.provider, s.timeout_s, s.orientation, s.default_query) == ("", None, "portrait", "lifestyle")
+    assert auto_image._image_settings() is s
+
+    monkeypatch.setenv("IMAGE_ORIENTATION", " Landscape ")
+    monkeypatch.setenv("IMAGE_TIMEOUT_S", "7.5")
+    s = auto_image._image_settings()
+    assert (s.orientation, s.timeout_s) == ("landscape", 7.5)
+
+
+def test_tokens_are_memoized_frozensets():
+    first = auto_image._tokens("新能源车 EV sales")
+    assert first == {"新能源车", "新能", "能源", "源车", "新", "能", "源", "车", "ev", "sales"}
+    assert isinstance(first, frozenset)
+    assert auto_image._tokens("新能源车 EV sales") is first
+
+
+def test_picked_images_download_concurrently_in_pick_order(monkeypatch, tmp_path):
+    monkeypatch.setenv("IMAGE_PROVIDER", "pexels")
+    monkeypatch.delenv("IMAGE_PARALLEL_QUERIES", raising=False)
+    monkeypatch.setattr(auto_image, "_load_pexels_config", lambda: ("k", "https://api.pexels.com"))
+    items = [
+        ImageItem(
+            provider="pexels",
+            id=str(i),
+            page_url=f"https://example.com/{i}",
+            download_url=f"https://example.com/{i}.jpg",
+            alt=alt,
+            width=2000,
+            height=3000,
+        )
+        for i, alt in enumerate(["harbor crane ship", "harbor night lights", "harbor fish market"], 1)
+    ]
+    monkeypatch.setattr(
+        auto_image, "_pexels_search_photos", lambda **kw: list(items) if kw["query"] == "harbor" else []
+    )
+    all_started = threading.Barrier(3, timeout=2)
+
+    def fake_download(*, url, dest_path, timeout_s):
+        all_started.wait()  # BrokenBarrierError if downloads ran one after another
+        if url.endswith("/2.jpg"):
+            raise RuntimeError("image download failed: 503")
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        dest_path.write_bytes(b"img")
+
+    monkeypatch.setattr(auto_image, "_download_image", fake_download)
+    paths, metas = fetch_and_download_related_images(
+        title="harbor", body="", topics=[], prompt_hint="", dest_dir=tmp_path, count=3
+    )
+    assert [m["picked"]["id"] for m in metas] == ["1", "3"]
+    assert [p.name for p in paths] == ["auto_image_pexels_1.jpg", "auto_image_pexels_3.jpg"]
+
+
+def test_missing_pexels_key_is_reported_without_searching(monkeypatch, tmp_path):
+    monkeypatch.setenv("IMAGE_PROVIDER", "pexels")
+
+    def no_key():
+        raise RuntimeError("Pexels api_key missing")
+
+    def unexpected_search(**kw):
+        raise AssertionError("search should not run without a key")
+
+    monkeypatch.setattr(auto_image, "_load_pexels_config", no_key)
+    monkeypatch.setattr(auto_image, "_pexels_search_photos", unexpected_search)
+    with pytest.raises(RuntimeError, match="api_key missing"):
+        fetch_and_download_related_images(
+            title="harbor", body="", topics=[], prompt_hint="", dest_dir=tmp_path, count=1
+        )
+
+
+@pytest.mark.parametrize(
+    "url, ext",
+    [
+        ("https://images.pexels.com/photos/1/pexels-photo-1.jpeg?auto=compress&h=1200", ".jpg"),
+        ("https://images.pexels.com/photos/1/photo.PNG#frag", ".png"),
+        ("https://cdn.example.com/a.webp", ".webp"),
+        ("https://images.pexels.com/photos/1", ".jpg"),
+        ("", ".jpg"),
+    ],
+)
+def test_guess_ext(url, ext):
+    assert auto_image._guess_ext(url) == ext
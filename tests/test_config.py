@@ -0,0 +1,21 @@
+import os
+
+from src.config import load_llm_config
+
+
+def test_load_llm_config_rereads_key_file_after_change(tmp_path, monkeypatch):
+    for name in ("LLM_MODEL", "LLM_API_KEY", "LLM_BASE_URL", "OPENAI_BASE_URL"):
+        monkeypatch.delenv(name, raising=False)
+    key_file = tmp_path / "llm_api-key.md"
+    key_file.write_text('model="m1"\napi_key="k1"\n', encoding="utf-8")
+
+    cfg = load_llm_config(llm_file=key_file)
+    assert (cfg.model, cfg.api_key) == ("m1", "k1")
+    assert load_llm_config(llm_file=key_file) == cfg
+
+    key_file.write_text('  model = "m2"\n# api_key="nope"\napi_key=\'k2\'\n', encoding="utf-8")
+    st = key_file.stat()
+    os.utime(key_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    cfg = load_llm_config(llm_file=key_file)
+    assert (cfg.model, cfg.api_key) == ("m2", "k2")
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.images import aliyun_images, auto_image
+
+_IMAGE_BYTES = bytes(range(256)) * 1024
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    client_ports: list[int] = []
+
+    def _reply(self, status: int, body: dict, etag: str = "") -> None:
+        raw = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self):
+        self.client_ports.append(self.client_address[1])
+        if self.path.startswith("/v1/search"):
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            host = self.headers["Host"]
+            photo = {
+                "id": 7,
+                "url": "https://www.pexels.com/photo/7/",
+                "alt": "cat",
+                "src": {"portrait": f"http://{host}/moved/7.jpg"},
+            }
+            self._reply(200, {"photos": [photo]}, etag='"v1"')
+        elif self.path.startswith("/moved/"):
+            self.send_response(302)
+            self.send_header("Location", self.path.replace("/moved/", "/img/"))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif self.path.startswith("/img/"):
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(_IMAGE_BYTES)))
+            self.end_headers()
+            self.wfile.write(_IMAGE_BYTES)
+        elif self.path.startswith("/bad"):
+            self._reply(400, {"code": "InvalidParameter", "message": "bad size"})
+        else:
+            self._reply(200, {"output": {"task_status": "RUNNING"}, "path": self.path})
+
+    def do_POST(self):
+        self.client_ports.append(self.client_address[1])
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self._reply(200, {"echo": payload})
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server(monkeypatch):
+    for name in ("http_proxy", "HTTP_PROXY"):
+        monkeypatch.delenv(name, raising=False)
+    _Handler.client_ports = []
+    auto_image._SEARCH_MEMO.clear()
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_polls_reuse_one_connection(server):
+    for _ in range(3):
+        resp = aliyun_images._http_get_json(url=f"{server}/api/v1/tasks/t1?x=1", headers={}, timeout_s=5)
+        assert resp["path"] == "/api/v1/tasks/t1?x=1"
+
+    resp = aliyun_images._http_post_json(url=f"{server}/create", payload={"prompt": "猫"}, headers={}, timeout_s=5)
+    assert resp == {"echo": {"prompt": "猫"}}
+
+    ports = _Handler.client_ports
+    assert len(set(ports[:3])) == 1
+
+
+def test_pexels_search_memo_skips_repeat_requests(server, monkeypatch):
+    monkeypatch.delenv("IMAGE_CACHE_DIR", raising=False)
+    search = dict(base_url=server, query="cat", per_page=5, orientation="portrait", timeout_s=5)
+
+    first = auto_image._pexels_search_photos(api_key="k", **search)
+    first.clear()  # callers get their own list
+    assert [i.id for i in auto_image._pexels_search_photos(api_key="k", **search)] == ["7"]
+    assert len(_Handler.client_ports) == 1
+    assert [key[0] for key in auto_image._SEARCH_MEMO] != ["k"]  # keyed on a digest, not the key
+
+    auto_image._pexels_search_photos(api_key="other", **search)
+    assert len(_Handler.client_ports) == 2
+
+
+def test_pexels_search_and_download_share_one_connection(server, tmp_path):
+    items = auto_image._pexels_search_photos(
+        api_key="k", base_url=server, query="cat", per_page=5, orientation="portrait", timeout_s=5
+    )
+    assert [i.id for i in items] == ["7"]
+
+    dest = tmp_path / "assets" / "7.jpg"
+    auto_image._download_image(url=items[0].download_url, dest_path=dest, timeout_s=5)
+    assert dest.read_bytes() == _IMAGE_BYTES
+    # search, redirect and image body all went over the same keep-alive socket
+    assert len(_Handler.client_ports) == 3
+    assert len(set(_Handler.client_ports)) == 1
+
+
+def test_pexels_cache_revalidates_search_and_reuses_downloads(server, tmp_path, monkeypatch):
+    monkeypatch.setenv("IMAGE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("IMAGE_CACHE_TTL_S", "0")
+    search = dict(api_key="k", base_url=server, query="cat", per_page=5, orientation="portrait", timeout_s=5)
+
+    first = auto_image._pexels_search_photos(**search)
+    auto_image._SEARCH_MEMO.clear()  # look past the in-process memo to the disk cache
+    second = auto_image._pexels_search_photos(**search)  # stale -> If-None-Match -> 304
+    assert second == first
+    assert len(_Handler.client_ports) == 2
+
+    monkeypatch.setenv("IMAGE_CACHE_TTL_S", "3600")
+    auto_image._SEARCH_MEMO.clear()
+    assert auto_image._pexels_search_photos(**search) == first
+    assert len(_Handler.client_ports) == 2  # fresh entry: no request at all
+
+    for post in ("p1", "p2"):
+        dest = tmp_path / post / "7.jpg"
+        auto_image._download_image(url=first[0].download_url, dest_path=dest, timeout_s=5)
+        assert dest.read_bytes() == _IMAGE_BYTES
+    assert len(_Handler.client_ports) == 4  # one redirect + one image fetch for both posts
+
+
+def test_http_error_body_becomes_api_error(server):
+    with pytest.raises(aliyun_images.AliyunImageAPIError) as exc:
+        aliyun_images._http_get_json(url=f"{server}/bad", headers={}, timeout_s=5)
+    assert exc.value.status == 400
+    assert exc.value.code == "InvalidParameter"
+    assert exc.value.message == "bad size"
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_helpers_roundtrip_with_and_without_orjson(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(aliyun_images, "orjson", None)
+    elif aliyun_images.orjson is None:
+        pytest.skip("orjson not installed")
+
+    payload = {"input": {"prompt": "小红书 封面"}, "parameters": {"n": 1, "watermark": False}}
+    raw = aliyun_images._json_dumps(payload)
+    assert isinstance(raw, bytes)
+    assert "小红书".encode("utf-8") in raw
+    assert aliyun_images._json_loads(raw) == payload
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import threading
+
+from src.publish import playwright_steps
+from src.storage.models import Execution, Post
+
+
+def _jobs(n: int) -> list[tuple]:
+    out = []
+    for i in range(n):
+        post = Post(id=f"p{i}", title=f"t{i}", body="b")
+        out.append((post, [], Execution(post_id=post.id)))
+    return out
+
+
+def _fake_batch(calls: list, threads: set, verify_modes: list | None = None):
+    lock = threading.Lock()
+
+    def fake_batch(jobs, *, dry_run=False, login_hold=0, wait_timeout_ms=0, verify_by_title=False):
+        jobs = list(jobs)
+        with lock:
+            calls.append([post.id for post, _assets, _exec in jobs])
+            threads.add(threading.get_ident())
+            if verify_modes is not None:
+                verify_modes.append(verify_by_title)
+        for _post, _assets, exec_rec in jobs:
+            exec_rec.result = "saved_draft"
+            yield exec_rec
+
+    return fake_batch
+
+
+def test_parallel_save_chunks_jobs_across_workers(monkeypatch):
+    calls: list[list[str]] = []
+    threads: set[int] = set()
+    verify_modes: list[bool] = []
+    monkeypatch.setattr(playwright_steps, "_resolve_cdp_url", lambda: "http://127.0.0.1:9222")
+    monkeypatch.setattr(playwright_steps, "run_save_draft_batch_sync", _fake_batch(calls, threads, verify_modes))
+
+    jobs = _jobs(5)
+    executions = list(playwright_steps.run_save_draft_parallel_sync(jobs, concurrency=2))
+
+    assert sorted(calls) == [["p0", "p2", "p4"], ["p1", "p3"]]
+    assert sorted(e.post_id for e in executions) == ["p0", "p1", "p2", "p3", "p4"]
+    assert all(e.result == "saved_draft" for e in executions)
+    assert threading.get_ident() not in threads
+    # Workers share one account's draft counter, so each save must be checked by its title.
+    assert verify_modes == [True, True]
+
+
+def test_parallel_save_without_cdp_runs_one_batch(monkeypatch):
+    calls: list[list[str]] = []
+    threads: set[int] = set()
+    verify_modes: list[bool] = []
+    monkeypatch.setattr(playwright_steps, "_resolve_cdp_url", lambda: None)
+    monkeypatch.setattr(playwright_steps, "run_save_draft_batch_sync", _fake_batch(calls, threads, verify_modes))
+
+    executions = list(playwright_steps.run_save_draft_parallel_sync(_jobs(3), concurrency=4))
+
+    assert calls == [["p0", "p1", "p2"]]
+    assert verify_modes == [False]
+    assert [e.post_id for e in executions] == ["p0", "p1", "p2"]
+    assert playwright_steps.effective_concurrency(4, 3) == 1
+
+
+class _FakeLocator:
+    def count(self) -> int:
+        return 1
+
+    @property
+    def first(self):
+        return self
+
+    def locator(self, _selector):
+        return self
+
+    def text_content(self) -> str:
+        return "t"
+
+
+class _FakePage:
+    def goto(self, *_args, **_kwargs) -> None:
+        pass
+
+    def locator(self, _selector):
+        return _FakeLocator()
+
+    def screenshot(self, *, path: str, **_kwargs) -> None:
+        open(path, "wb").close()
+
+    def content(self) -> str:
+        return "<html></html>"
+
+
+class _FakePlaywright:
+    def __init__(self, exit_error: Exception | None = None):
+        self._exit_error = exit_error
+        page = _FakePage()
+
+        class _Context:
+            pages = [page]
+
+            def set_default_timeout(self, _ms) -> None:
+                pass
+
+        class _Chromium:
+            def launch_persistent_context(self, *_args, **_kwargs):
+                return _Context()
+
+        self.chromium = _Chromium()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        if self._exit_error is not None:
+            raise self._exit_error
+        return False
+
+
+def test_delete_batch_keeps_evidence_and_session_errors_per_type(monkeypatch, tmp_path):
+    monkeypatch.setattr(playwright_steps, "_repo_root", lambda: tmp_path)
+    monkeypatch.setattr(playwright_steps, "_resolve_profile_config", lambda: (tmp_path / "profile", None, []))
+    monkeypatch.setattr(
+        playwright_steps, "sync_playwright", lambda: _FakePlaywright(RuntimeError("driver died"))
+    )
+    monkeypatch.setattr(playwright_steps, "_wait_for_any_text", lambda *a, **k: "ok")
+    monkeypatch.setattr(playwright_steps, "_open_draft_box", lambda page: True)
+    monkeypatch.setattr(playwright_steps, "_open_draft_tab", lambda page, dtype: True)
+    monkeypatch.setattr(playwright_steps, "_collect_draft_items", lambda page, limit=None: [{"title": "t"}])
+    monkeypatch.setattr(playwright_steps, "_extract_draft_count", lambda page: None)
+    monkeypatch.setattr(playwright_steps, "_wait_for_draft_list_change", lambda page, **k: True)
+    monkeypatch.setattr(playwright_steps, "save_event", lambda payload: tmp_path / "event.json")
+    outcomes = iter([(False, "delete button missing"), (True, "t")])
+    monkeypatch.setattr(playwright_steps, "_delete_first_draft_item", lambda page: next(outcomes))
+
+    image, video = playwright_steps.run_delete_drafts_batch_sync(draft_types=["image", "video"])
+
+    assert image["errors"] == ["delete button missing"]
+    assert "evidence_dir" in image
+    assert video["deleted"] == 1
+    assert video["errors"] == []
+    assert "evidence_dir" not in video
+
+
+class _TabContext:
+    def __init__(self, launch_tabs: int):
+        self.pages: list[_Tab] = []
+        for _ in range(launch_tabs):
+            self.new_page()
+
+    def new_page(self):
+        tab = _Tab(self)
+        self.pages.append(tab)
+        return tab
+
+    def close(self) -> None:
+        pass
+
+
+class _Tab:
+    def __init__(self, ctx: _TabContext):
+        self._ctx = ctx
+
+    def close(self) -> None:
+        self._ctx.pages.remove(self)
+
+
+def _run_batch_with(monkeypatch, tmp_path, ctx: _TabContext, should_close_context: bool) -> list:
+    used: list = []
+    monkeypatch.setattr(playwright_steps, "_resolve_profile_config", lambda: (tmp_path / "profile", None, []))
+    monkeypatch.setattr(playwright_steps, "sync_playwright", lambda: _FakePlaywright())
+    monkeypatch.setattr(
+        playwright_steps, "_launch_context", lambda *a: (ctx, should_close_context, "detail")
+    )
+    monkeypatch.setattr(playwright_steps, "save_execution", lambda exec_rec: None)
+
+    def fake_save(page, post, *, exec_rec, **kwargs):
+        used.append(page)
+        exec_rec.result = "saved_draft"
+        return exec_rec
+
+    monkeypatch.setattr(playwright_steps, "_save_draft_on_page", fake_save)
+    list(playwright_steps.run_save_draft_batch_sync(_jobs(3)))
+    return used
+
+
+def test_batch_reuses_launch_tab_with_persistent_profile(monkeypatch, tmp_path):
+    ctx = _TabContext(launch_tabs=1)
+    launch_tab = ctx.pages[0]
+    used = _run_batch_with(monkeypatch, tmp_path, ctx, should_close_context=True)
+
+    assert used[0] is launch_tab
+    assert launch_tab not in used[1:]
+    assert ctx.pages == [launch_tab]  # no blank launch tab, later tabs closed
+
+
+def test_batch_never_uses_existing_tab_over_cdp(monkeypatch, tmp_path):
+    ctx = _TabContext(launch_tabs=1)
+    user_tab = ctx.pages[0]
+    used = _run_batch_with(monkeypatch, tmp_path, ctx, should_close_context=False)
+
+    assert user_tab not in used
+    assert ctx.pages == [user_tab]
@@ -4,6 +4,9 @@ from tempfile import TemporaryDirectory
 from src.storage.files import (
     copy_assets_into_post,
     ensure_dirs,
+    glob_files,
+    list_posts,
+    list_posts_summary,
     load_post,
     save_execution,
     save_post,
@@ -43,3 +46,37 @@ def test_copy_assets_and_execution():
         save_execution(exec_rec, base=base)
         exec_path = base / "posts" / post.id / "executions" / f"{exec_rec.id}.json"
         assert exec_path.exists()
+
+
+def test_list_posts_summary_reads_display_fields():
+    with TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        ensure_dirs(base)
+        post = Post(title="t", body="b")
+        save_post(post, base=base)
+        (base / "posts" / "broken").mkdir()
+        (base / "posts" / "broken" / "post.json").write_text("{", encoding="utf-8")
+
+        summaries = list_posts_summary(base=base)
+        assert len(summaries) == 1
+        assert summaries[0].id == post.id
+        assert summaries[0].type == "image"
+        assert summaries[0].status == "draft"
+        assert summaries[0].title == "t"
+        # `list` prints these fields; keep the format identical to list_posts().
+        full = list_posts(base=base)[0]
+        assert f"{summaries[0].type} | {summaries[0].status}" == f"{full.type} | {full.status}"
+
+
+def test_glob_files_lists_regular_files_only():
+    with TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        (base / "a.png").write_bytes(b"a")
+        (base / "b.jpg").write_bytes(b"b")
+        (base / ".hidden").write_bytes(b"h")
+        (base / "sub").mkdir()
+        (base / "sub" / "c.png").write_bytes(b"c")
+
+        assert sorted(glob_files(f"{tmp}/*")) == [str(base / "a.png"), str(base / "b.jpg")]
+        assert glob_files(f"{tmp}/*.png") == [str(base / "a.png")]
+        assert glob_files(f"{tmp}/missing/*") == []